@@ -1,8 +1,8 @@
 import time
 
+import pandas as pd
 from Workbench.CryptoDataConnector.HyperliquidDataCollector import HyperliquidDataCollector
 from Workbench.config.ConnectionConstant import QUEST_HOST, QUEST_PORT, CLARENCE_QUEST_HOST
-from Workbench.model.dto.FundingRate import FundingRate
 from Workbench.transport.QuestClient import QuestDBClient
 from datetime import datetime, timedelta
 
@@ -42,6 +42,7 @@ if __name__ == '__main__':
         ts = int(ts.timestamp() * 1000) if ts else None
 
         payload = []
+        rows = []
         end_of_page = False
         start_ts = int((datetime.now() - timedelta(days=180)).timestamp())
         end_ts = int(datetime(2025, 9, 1, 22, 0).timestamp() * 1000)
@@ -62,15 +63,16 @@ if __name__ == '__main__':
                         break
                     else:
                         annual_rate = round(float(funding['fundingRate']) * 24 * 365 * 100, 4)
-                        funding_rate = FundingRate(symbol=symbol,
-                                                   annual_funding_rate=annual_rate,
-                                                   timestamp=float(funding['time'] / 1000),
-                                                   exchange="Hyperliquid")
-                        batch = funding_rate.to_batch()
-                        write_client.batch_write(batch)
+                        rows.append((symbol, "Hyperliquid", annual_rate, funding['time']))
                 start_ts = hist_funding[-1]['time']
                 print(f"Processed funding for {symbol} up to {datetime.fromtimestamp(start_ts/1000).strftime('%Y-%m-%d %H:%M:%S')}")
                 time.sleep(1)
             except Exception as e:
                 print(f"Error fetching historical funding for {symbol}: {e}")
                 break
+        if rows:
+            df = pd.DataFrame(rows, columns=["symbol", "exchange", "annual_funding_rate", "timestamp"])
+            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+            write_client.write_dataframe("funding_rate", df, symbols=["symbol", "exchange"], at="timestamp")
+            print(f"Queued {len(df)} funding rows for {symbol}")
+    write_client.stop()
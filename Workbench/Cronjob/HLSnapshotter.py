@@ -1,10 +1,9 @@
 import time
 
+import pandas as pd
 import schedule
 from Workbench.CryptoDataConnector.HyperliquidDataCollector import HyperliquidDataCollector
 from Workbench.CryptoWebsocketDataCollector.HyperliquidWSCollector import HyperliquidWSCollector
-from Workbench.model.dto.FundingRate import FundingRate
-from Workbench.model.dto.OpenInterest import OpenInterest
 from Workbench.transport.QuestClient import QuestDBClient
 from Workbench.config.ConnectionConstant import QUEST_PORT, QUEST_HOST, CLARENCE_QUEST_HOST, CLARENCE_QUEST_PORT
 from Workbench.util.TimeUtil import get_timestamp, get_now, get_now_utc
@@ -14,31 +13,21 @@ def get_funding(client: HyperliquidDataCollector , db_client: QuestDBClient):
     print("Getting funding from Hyperliquid")
     funding_rate = client.get_funding()
     if funding_rate:
-        for coin, rate in funding_rate.items():
-            funding_rate = FundingRate(
-                timestamp=get_timestamp(),
-                exchange="Hyperliquid",
-                symbol=coin,
-                annual_funding_rate=round(rate * 100, 4),
-            )
-            funding_batch = funding_rate.to_batch()
-            if funding_batch:
-                db_client.batch_write(funding_batch)
+        df = pd.DataFrame({"symbol": list(funding_rate),
+                           "exchange": "Hyperliquid",
+                           "annual_funding_rate": [round(rate * 100, 4) for rate in funding_rate.values()],
+                           "timestamp": get_now_utc()})
+        db_client.write_dataframe("funding_rate", df, symbols=["symbol", "exchange"], at="timestamp")
 
 def get_open_interest(client: HyperliquidDataCollector, db_client: QuestDBClient):
     print("Fetching open interest data...")
     open_interest = client.get_open_interest()
     if open_interest:
-        for coin, oi in open_interest.items():
-            open_interest = OpenInterest(
-                timestamp=get_now_utc(),
-                exchange="Hyperliquid",
-                symbol=coin,
-                open_interest=round(oi , 2),
-            )
-            oi_batch = open_interest.to_batch()
-            if oi_batch:
-                db_client.batch_write(oi_batch)
+        df = pd.DataFrame({"symbol": list(open_interest),
+                           "exchange": "Hyperliquid",
+                           "open_interest": [round(oi, 2) for oi in open_interest.values()],
+                           "timestamp": get_now_utc()})
+        db_client.write_dataframe("open_interest", df, symbols=["symbol", "exchange"], at="timestamp")
 if __name__ == "__main__":
     db_client = QuestDBClient(host=CLARENCE_QUEST_HOST, port=CLARENCE_QUEST_PORT)
     data_client = HyperliquidDataCollector()
@@ -17,8 +17,12 @@ class BinanceDataCollector(BaseDataCollector):
         self.base_futures_url = BINANCE_FUTURES_API_URL
 
 
-    def get_depth(self):
-        pass  # To be implemented if needed
+    def get_depth(self, symbol="BTCUSDT", limit=1000):
+        url = f"{self.base_futures_url}/fapi/v1/depth"
+        params = {"symbol": symbol, "limit": limit}
+        resp = self.session.get(url, params=params)
+        resp.raise_for_status()
+        return resp.json()
 
     def get_kline(self, symbol="BTCUSDT", interval="1m", limit=100):
         url = f"{self.base_spot_url}/api/v3/klines"
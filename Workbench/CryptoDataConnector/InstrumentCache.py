@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+from Workbench.CryptoDataConnector.BinanceDataCollector import BinanceDataCollector
+from Workbench.CryptoDataConnector.BybitDataCollector import BybitDataCollector
+from Workbench.CryptoDataConnector.HTXDataCollector import HTXDataCollector
+from Workbench.CryptoDataConnector.HyperliquidDataCollector import HyperliquidDataCollector
+
+DEFAULT_CACHE_DIR = os.getenv("WORKBENCH_INSTRUMENT_CACHE", os.path.join(os.path.expanduser("~"), ".workbench", "instruments"))
+DEFAULT_TTL_SEC = 6 * 3600
+
+# exchange -> factory for the contract-details download, as used by the collectors and traders
+FETCHERS = {
+    "Binance": lambda: BinanceDataCollector().get_contract_details(),
+    "HTX": lambda: HTXDataCollector().get_contract_details(),
+    "Bybit": lambda: BybitDataCollector().get_contract_details(),
+    "Hyperliquid": lambda: HyperliquidDataCollector().get_contract_details(),
+}
+
+
+class InstrumentCache:
+    """
+    Process-wide cache of contract-details downloads keyed by exchange, persisted to one JSON file per exchange.
+    A fresh entry is served from memory or disk; a stale one is served immediately while a background thread
+    refreshes it, and only a missing entry blocks on the REST call. Concurrent requests for the same exchange
+    share one download.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL_SEC, fetchers: dict = None):
+        self.logger = logging.getLogger("InstrumentCache")
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.fetchers = dict(FETCHERS if fetchers is None else fetchers)
+        self._entries = {}  # exchange -> (fetched_at, data)
+        self._locks = {exchange: threading.Lock() for exchange in self.fetchers}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = InstrumentCache()
+            return cls._instance
+
+    def get(self, exchange: str):
+        """
+        Contract details for exchange, a DataFrame for the REST endpoints returning rows (Binance, HTX, Bybit)
+        or the raw response otherwise (Hyperliquid). DataFrames are copies, callers may filter them freely.
+        """
+        entry = self._entries.get(exchange) or self._load(exchange)
+        if entry is None:
+            entry = self.refresh(exchange)
+        elif time.time() - entry[0] > self.ttl:
+            self._refresh_in_background(exchange)
+        data = entry[1]
+        return data.copy() if isinstance(data, pd.DataFrame) else data
+
+    def refresh(self, exchange: str):
+        """
+        Download contract details now and update memory and disk.
+        :return: (fetched_at, data)
+        """
+        lock = self._locks.setdefault(exchange, threading.Lock())
+        started = time.time()
+        with lock:
+            entry = self._entries.get(exchange)
+            if entry is not None and entry[0] >= started:
+                return entry  # another thread finished the download while we waited
+            data = self.fetchers[exchange]()
+            entry = (time.time(), data)
+            self._entries[exchange] = entry
+            self._save(exchange, entry)
+            self.logger.info(f"Refreshed {exchange} instrument details")
+            return entry
+
+    def invalidate(self, exchange: str = None):
+        for name in [exchange] if exchange else list(self._entries):
+            self._entries.pop(name, None)
+            path = self._path(name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _refresh_in_background(self, exchange: str):
+        with self._lock:
+            if exchange in self._refreshing:
+                return
+            self._refreshing.add(exchange)
+
+        def run():
+            try:
+                self.refresh(exchange)
+            except Exception as e:
+                self.logger.error(f"Background refresh of {exchange} instrument details failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(exchange)
+
+        threading.Thread(target=run, name=f"instrument-refresh-{exchange}", daemon=True).start()
+
+    def _path(self, exchange: str) -> str:
+        return os.path.join(self.cache_dir, f"{exchange.lower()}.json")
+
+    def _load(self, exchange: str):
+        path = self._path(exchange)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable instrument cache {path}: {e}")
+            return None
+        data = pd.DataFrame.from_dict(stored["data"]) if stored.get("format") == "records" else stored["data"]
+        entry = (stored["fetched_at"], data)
+        self._entries[exchange] = entry
+        return entry
+
+    def _save(self, exchange: str, entry: tuple):
+        fetched_at, data = entry
+        if isinstance(data, pd.DataFrame):
+            stored = {"fetched_at": fetched_at, "format": "records", "data": json.loads(data.to_json(orient="records"))}
+        else:
+            stored = {"fetched_at": fetched_at, "format": "raw", "data": data}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(exchange) + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self._path(exchange))  # readers never see a half written file
+        except OSError as e:
+            self.logger.warning(f"Could not persist {exchange} instrument details: {e}")
+
+
+def get_contract_details(exchange: str):
+    """
+    Contract details for exchange from the process-wide InstrumentCache.
+    """
+    return InstrumentCache.get_instance().get(exchange)
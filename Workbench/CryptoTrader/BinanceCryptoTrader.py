@@ -1,4 +1,4 @@
-import json
+from Workbench.transport import json_codec
 import time
 import hmac
 import hashlib
@@ -15,7 +15,7 @@ from Workbench.model.OrderEnum import OrderSide, OrderDirection, OrderType
 from Workbench.model.order.Order import Order
 from Workbench.model.position.positions import Position, PositionBooks
 from Workbench.transport.websocket_client import WebsocketClient
-from Workbench.CryptoDataConnector.BinanceDataCollector import BinanceDataCollector
+from Workbench.CryptoDataConnector.InstrumentCache import get_contract_details
 from threading import Thread
 
 from Workbench.util.OrderUtil import get_uuid
@@ -51,7 +51,7 @@ class BinanceCryptoTrader(CryptoTraderBase):
         Create a cache for contract sizes.
         This method can be used to pre-load contract sizes and map to a dict for O(1) access.
         """
-        self.contract_info = BinanceDataCollector().get_contract_details()
+        self.contract_info = get_contract_details("Binance")
         tmp = {}
         for index, row in self.contract_info.iterrows():
             tmp[row['symbol']] = row['filters']
@@ -115,7 +115,7 @@ class BinanceCryptoTrader(CryptoTraderBase):
         Handle messages from the Binance Futures trade WebSocket.
         """
         # Implement the logic to handle trade messages
-        msg = json.loads(msg)
+        msg = json_codec.loads(msg)
         action = self.event_id.get(msg['id'], None)
         status = msg['status']
         if status != 200:
@@ -1,4 +1,4 @@
-import json
+from Workbench.transport import json_codec
 import time
 import hmac
 import hashlib
@@ -150,7 +150,7 @@ class BybitCryptoTrader(CryptoTraderBase):
         self.ws_trade_client.send(order_payload)
 
     def _trade_ws_handler(self, msg):
-        msg = json.loads(msg)
+        msg = json_codec.loads(msg)
         action = self.event_id.get(msg.get('id'), None)
         if msg.get("ret_code", 0) != 0:
             self.logger.error(f"Error in message: {msg}")
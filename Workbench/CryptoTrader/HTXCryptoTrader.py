@@ -3,7 +3,7 @@ import math
 from overrides import overrides
 
 from Workbench.CryptoTrader.CryptoTraderBase import CryptoTraderBase
-from Workbench.CryptoDataConnector.HTXDataCollector import HTXDataCollector
+from Workbench.CryptoDataConnector.InstrumentCache import get_contract_details
 from Workbench.config.ConnectionConstant import HTX_SPOT_API_URL, HTX_FUTURES_API_URL, HTX_TRADE_WS_URL, \
     HTX_SWAP_WS_NOTIFICATION_URL
 from Workbench.config.CredentialConstant import HTX_API_KEY, HTX_API_SECRET
@@ -51,7 +51,7 @@ class HTXCryptoTrader(CryptoTraderBase):
             self._noti_ws_subscribe()
 
     def _create_contract_size_cache(self):
-        self.contract_info = HTXDataCollector().get_contract_details()
+        self.contract_info = get_contract_details("HTX")
         tmp = {}
         for index, row in self.contract_info.iterrows():
             code = row['contract_code'].replace('-', '')
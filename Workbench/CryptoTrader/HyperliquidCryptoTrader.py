@@ -5,6 +5,7 @@ from Workbench.config.CredentialConstant import HYPERLIQUID_PUBLIC_WALLET, HYPER
 from Workbench.model.order.Order import Order
 from Workbench.model.OrderEnum import OrderSide, OrderType, OrderDirection
 from Workbench.transport.websocket_client import WebsocketClient
+from Workbench.transport import json_codec
 from threading import Thread
 import pandas as pd
 import requests
@@ -89,7 +90,7 @@ class HyperliquidCryptoTrader(CryptoTraderBase):
         :return:
         """
         try:
-            data = json.loads(msg)
+            data = json_codec.loads(msg)
         except Exception as e:
             self.logger.error(f"Failed to decode WS message: {e}")
             return
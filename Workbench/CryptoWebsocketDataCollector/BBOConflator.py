@@ -0,0 +1,96 @@
+import copy
+import threading
+import time
+
+from Workbench.model.dto.TopOfBook import TopOfBook
+
+
+class BBOConflator:
+    """
+    Change-only publishing stage between a collector's per-symbol TopOfBook and its sink (usually QuestDB).
+    A quote is published only when bid/ask price or qty differ from the last published values. With
+    min_interval_ms set, changes arriving sooner than that after the previous publish are held as pending and the
+    latest value is published once the interval has passed, by the next offer or by a timer armed only while
+    something is pending, so intermediate quotes are conflated but the final BBO is never dropped.
+    """
+
+    def __init__(self, sink, min_interval_ms: float = 0):
+        """
+        :param sink: callable(TopOfBook), must copy what it keeps since TopOfBook instances are updated in place.
+        With min_interval_ms set it is called with the lock held, from the offering thread or the timer thread.
+        """
+        self.sink = sink
+        self.min_interval_ms = min_interval_ms
+        self.last_published = {}  # symbol -> (bid_price, bid_qty, ask_price, ask_qty)
+        self.published = 0
+        self.suppressed = 0
+        self._last_publish_ms = {}
+        self._pending = {}  # symbol -> TopOfBook copy, never the collector's live instance
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def offer(self, bbo: TopOfBook) -> bool:
+        """
+        :return: True if the quote was published now.
+        """
+        if not self.min_interval_ms:
+            values = (bbo.bid_price, bbo.bid_qty, bbo.ask_price, bbo.ask_qty)
+            if self.last_published.get(bbo.symbol) == values:
+                self.suppressed += 1
+                return False
+            self._publish(bbo, values)
+            return True
+        with self._lock:
+            values = (bbo.bid_price, bbo.bid_qty, bbo.ask_price, bbo.ask_qty)
+            symbol = bbo.symbol
+            if self.last_published.get(symbol) == values:
+                self._pending.pop(symbol, None)  # changed and changed back within the interval
+                self.suppressed += 1
+                return False
+            now_ms = time.monotonic() * 1000
+            if now_ms - self._last_publish_ms.get(symbol, float("-inf")) < self.min_interval_ms:
+                self._pending[symbol] = copy.copy(bbo)
+                self.suppressed += 1
+                self._arm_timer()
+                return False
+            self._pending.pop(symbol, None)
+            self._last_publish_ms[symbol] = now_ms
+            self._publish(bbo, values)
+            return True
+
+    def flush(self, force: bool = False):
+        """
+        Publish pending quotes whose interval has passed, or all of them with force=True.
+        """
+        with self._lock:
+            now_ms = time.monotonic() * 1000
+            for symbol, bbo in list(self._pending.items()):
+                if force or now_ms - self._last_publish_ms.get(symbol, float("-inf")) >= self.min_interval_ms:
+                    del self._pending[symbol]
+                    self._last_publish_ms[symbol] = now_ms
+                    self._publish(bbo, (bbo.bid_price, bbo.bid_qty, bbo.ask_price, bbo.ask_qty))
+
+    def get_last(self, symbol: str):
+        """
+        Last published (bid_price, bid_qty, ask_price, ask_qty) for symbol.
+        """
+        return self.last_published.get(symbol)
+
+    def _publish(self, bbo: TopOfBook, values: tuple):
+        self.last_published[bbo.symbol] = values
+        self.published += 1
+        self.sink(bbo)
+
+    def _arm_timer(self):
+        # called with the lock held
+        if self._timer is None:
+            self._timer = threading.Timer(self.min_interval_ms / 1000, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self):
+        self.flush()
+        with self._lock:
+            self._timer = None
+            if self._pending:
+                self._arm_timer()
@@ -1,19 +1,51 @@
 import logging
 from Workbench.transport.websocket_client import WebsocketClient
+from Workbench.transport.frame_recorder import FrameRecorder, FrameReplayer
+from Workbench.CryptoWebsocketDataCollector.BBOConflator import BBOConflator
+from Workbench.model.dto.TopOfBook import TOP_OF_BOOK_LAYOUT
 from abc import ABC, abstractmethod
 
 class BaseWSCollector(ABC):
     """
     Base class for WebSocket data collectors.
+    Set `client_class = AsyncWebsocketClient` on a subclass (or pass client_class) to run the connection on the
+    shared asyncio event loop instead of a dedicated thread.
+    Top of book goes to QuestDB through `self.conflator`, which drops quotes whose best levels did not change and,
+    with `conflation_interval_ms`, publishes at most one quote per symbol per interval.
     """
-    def __init__(self,name, url: str):
+    client_class = WebsocketClient
+    conflation_interval_ms = 0
+
+    def __init__(self,name, url: str, client_class=None, conflation_interval_ms: float = None):
         self.logger = logging.getLogger(name)
         self.name = name
         self.url = url
-        self.client = WebsocketClient(url)
+        self.client = (client_class or self.client_class)(url)
         self.data = None
+        self.db_client = None
+        if conflation_interval_ms is None:
+            conflation_interval_ms = self.conflation_interval_ms
+        self.conflator = BBOConflator(self._write_top_of_book, conflation_interval_ms)
         self.logger.info("Initializing WebSocket client...{}".format(url))
 
+    def record(self, path: str):
+        """
+        Append every raw frame received by this collector to a capture file.
+        """
+        self.client.recorder = FrameRecorder(path)
+        self.logger.info("Recording frames to {}".format(path))
+
+    def replay(self, path: str, speed: float = None) -> int:
+        """
+        Push a capture file through this collector's message handler without connecting.
+        :param speed: None replays as fast as possible, 1.0 at recorded pace.
+        """
+        return FrameReplayer(path).replay(self._message_handler, speed)
+
+    def _write_top_of_book(self, bbo):
+        if self.db_client is not None:
+            self.db_client.batch_write_row(TOP_OF_BOOK_LAYOUT, bbo.to_row())
+
     @abstractmethod
     def load_instrument(self):
         """
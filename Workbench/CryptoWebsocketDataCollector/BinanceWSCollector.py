@@ -1,11 +1,16 @@
-import json
 import time
+import threading
 from Workbench.config.ConnectionConstant import BINANCE_FUTURES_WS_URL, BINANCE_FUTURES_API_URL, QUEST_HOST, QUEST_PORT
 from Workbench.CryptoDataConnector.BinanceDataCollector import BinanceDataCollector
+from Workbench.CryptoDataConnector.InstrumentCache import get_contract_details
 from Workbench.CryptoWebsocketDataCollector import BaseWSCollector
-from Workbench.util.TimeUtil import get_latency_ms, get_utc_now_ms
+from Workbench.util.TimeUtil import get_latency_ms
 from Workbench.model.orderbook.BTreeOrderbook import OrderbookCollection, BTreeOrderbook, Order, Side
+from Workbench.model.orderbook.SequencedOrderbook import SequencedOrderbook
+from Workbench.model.InstrumentRegistry import InstrumentRegistry
 from Workbench.transport.QuestClient import QuestDBClient
+from Workbench.transport.ingest_queue import CONFLATE
+from Workbench.transport.topic_router import TopicRouter
 from Workbench.model.dto.TopOfBook import TopOfBook
 
 BINANCE_WS_TOPICS = {
@@ -40,42 +45,67 @@ class BinanceWSCollector(BaseWSCollector):
     Binance WebSocket data collector.
     """
     orderbook: OrderbookCollection
+    conflation_interval_ms = 10
 
-    def __init__(self, url=BINANCE_FUTURES_WS_URL, start_quest = True):
-        super().__init__("BinanceWS", url)
+    def __init__(self, url=BINANCE_FUTURES_WS_URL, start_quest = True, conflation_interval_ms: float = None):
+        super().__init__("BinanceWS", url, conflation_interval_ms=conflation_interval_ms)
         self.data_collector = BinanceDataCollector()
         self.load_instrument()
-        self.last_publish = {}
         self.tickerbook = {}
+        self.orderbook = OrderbookCollection("Binance", book_type=SequencedOrderbook)
+        # "btcusdt@bookTicker" -> "bookTicker", "btcusdt@depth@100ms" -> "depth"
+        self.router = TopicRouter("stream", route_key=lambda topic: topic.split("@")[1])
+        self.router.register("bookTicker", lambda msg: self._handler_book_ticker(msg["data"]))
+        self.router.register("depth", lambda msg: self._handler_depth(msg["data"]))
         if start_quest:
-            self.db_client = QuestDBClient(host=QUEST_HOST, port=QUEST_PORT)
+            self.db_client = QuestDBClient(host=QUEST_HOST, port=QUEST_PORT, queue_policy=CONFLATE)
 
     def load_instrument(self):
-        obj = self.data_collector.get_contract_details()
+        obj = get_contract_details("Binance")
         # apply PERP filter
         obj = obj[obj['contractType'] == 'PERPETUAL']
         # apply USDT filter
         obj = obj[obj['quoteAsset'] == 'USDT']
         self.instrument_info = obj
+        self.instruments = InstrumentRegistry.from_binance(obj)
 
     def disconnect(self):
         pass
 
     def subscribe(self,topic_list: list = None):
-        setattr(self, "orderbook", OrderbookCollection("Binance"))
+        """
+        Subscribe to book tickers. Orderbooks are keyed by the uppercase symbol Binance sends and only created by
+        subscribe_depth, since only the depth stream feeds them.
+        """
         if topic_list is None:
             return
         topic_list = [inst.replace("-", "").lower() for inst in topic_list]
         topic_template = BINANCE_WS_TOPICS['market']["book_ticker"]
         for inst in topic_list:
             self.logger.info("Subscribing to topic {}".format(inst))
-            self.orderbook.add_orderbook(inst)
             topic = topic_template.format(symbol=inst)
             self.client.send({
                 "method": "SUBSCRIBE",
                 "params": [topic],
                 "id": 1
-            })
+            }, coalesce="params")
+
+    def subscribe_depth(self, topic_list: list, speed: str = "100ms"):
+        """
+        Subscribe to the incremental diff-depth stream, books are synced from a REST snapshot on the first
+        update and again whenever an update ID gap is detected.
+        """
+        topic_template = BINANCE_WS_TOPICS['market']["diff_book_depth"]
+        for inst in topic_list:
+            symbol = inst.replace("-", "").upper()
+            self.logger.info("Subscribing to depth for {}".format(symbol))
+            self.orderbook.add_orderbook(symbol)
+            self.orderbook.get_orderbook(symbol).resync_handler = self._resync_orderbook
+            self.client.send({
+                "method": "SUBSCRIBE",
+                "params": [topic_template.format(symbol=symbol.lower(), speed=speed)],
+                "id": 1
+            }, coalesce="params")
 
     def unsubscribe(self, topic: str):
         pass
@@ -89,10 +119,8 @@ class BinanceWSCollector(BaseWSCollector):
         :param symbol: The trading pair symbol.
         :return: The contract size.
         """
-        contract_info = self.instrument_info[self.instrument_info['symbol'] == symbol]
-        if not contract_info.empty:
-            return float(contract_info['contractSize'].values[0])
-        return None
+        spec = self.instruments.get(symbol)
+        return spec.contract_size if spec is not None else None
 
     def _handler_book_ticker(self, msg):
         """
@@ -102,38 +130,53 @@ class BinanceWSCollector(BaseWSCollector):
         """
         # self.logger.info(msg)
         # contract_size = self._get_contract_size(msg["s"])
-        bbo = TopOfBook(
-            timestamp=msg.get("E"),
-            exchange="Binance",
-            symbol=msg.get('s'),
-            bid_price=float(msg.get('b')),
-            bid_qty=float(msg.get('B')),
-            ask_price=float(msg.get('a')),
-            ask_qty=float(msg.get('A')),
-        )
-        self.tickerbook[msg.get('s')] = bbo
-        bbo = bbo.to_batch()
-        if get_utc_now_ms() - self.last_publish.get(msg.get('s'), 0) > 10:
-            self.last_publish[msg.get('s')] = get_utc_now_ms()
-            self.db_client.batch_write(bbo)
+        symbol = msg['s']
+        bbo = self.tickerbook.get(symbol)
+        if bbo is None:
+            bbo = self.tickerbook[symbol] = TopOfBook(0, "Binance", symbol, None, None, None, None)
+        bbo.update(msg['E'], float(msg['b']), float(msg['B']), float(msg['a']), float(msg['A']))
+        self.orderbook.publish_bbo(symbol, bbo.timestamp, bbo.bid_price, bbo.bid_qty, bbo.ask_price, bbo.ask_qty)
+        self.conflator.offer(bbo)
+
+    def _handler_depth(self, msg):
+        """
+        Handle diff-depth updates, U/u are the first/last update IDs in the event and pu the previous event's u.
+        """
+        book = self.orderbook.get_orderbook(msg.get('s'))
+        if book is None:
+            return
+        book.apply_sequenced_delta(msg['b'], msg['a'], msg['U'], msg['u'], msg['pu'], msg.get('E', 0))
+
+    def _resync_orderbook(self, book: SequencedOrderbook):
+        threading.Thread(target=self._load_depth_snapshot, args=(book,), daemon=True).start()
+
+    def _load_depth_snapshot(self, book: SequencedOrderbook):
+        try:
+            snapshot = self.data_collector.get_depth(symbol=book.instrument, limit=1000)
+            book.stage_snapshot(snapshot['bids'], snapshot['asks'], snapshot['lastUpdateId'], snapshot.get('E', 0))
+            self.logger.info(f"Loaded depth snapshot for {book.instrument} @ {snapshot['lastUpdateId']}")
+        except Exception as e:
+            self.logger.error(f"Failed to load depth snapshot for {book.instrument}: {e}")
+            book.abort_resync()
 
     def _message_handler(self, msg):
         """
         Handle incoming messages from the WebSocket.
         """
         #self.logger.info("Received message: %s", msg)
-        msg = json.loads(msg)
-        if msg.get("stream", None):
-            topic = msg["stream"]
-            if "bookTicker" in topic:
-
-                self._handler_book_ticker(msg['data'])
+        self.router.dispatch(msg)
 
-    def run(self):
+    def start(self):
+        """
+        Connect and start handling messages without subscribing to anything.
+        """
         self.load_instrument()
         self.client.register_callback(self._message_handler)
         self.client.start()
         time.sleep(1)
+
+    def run(self):
+        self.start()
         self.subscribe()
 
     def connect(self):
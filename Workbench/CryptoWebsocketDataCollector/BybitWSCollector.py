@@ -1,13 +1,17 @@
-import json
 import time
 import threading
 from Workbench.config.ConnectionConstant import BYBIT_FUTURES_WS_URL, QUEST_HOST, QUEST_PORT
 from Workbench.CryptoDataConnector.BybitDataCollector import BybitDataCollector
+from Workbench.CryptoDataConnector.InstrumentCache import get_contract_details
 from Workbench.CryptoWebsocketDataCollector import BaseWSCollector
 from Workbench.model.orderbook.BTreeOrderbook import OrderbookCollection, BTreeOrderbook, Order, Side
+from Workbench.model.orderbook.SequencedOrderbook import SequencedOrderbook
+from Workbench.model.InstrumentRegistry import InstrumentRegistry
 from Workbench.model.dto.TopOfBook import TopOfBook
 from Workbench.util.TimeUtil import get_latency_ms
 from Workbench.transport.QuestClient import QuestDBClient
+from Workbench.transport.ingest_queue import CONFLATE
+from Workbench.transport.topic_router import TopicRouter
 
 BYBIT_WS_TOPICS = {
     "market": {
@@ -37,32 +41,42 @@ class BybitWSCollector(BaseWSCollector):
     """
     orderbook: OrderbookCollection
 
-    def __init__(self, url=BYBIT_FUTURES_WS_URL):
-        super().__init__("BybitWS", url)
+    def __init__(self, url=BYBIT_FUTURES_WS_URL, start_quest=True, conflation_interval_ms: float = None):
+        super().__init__("BybitWS", url, conflation_interval_ms=conflation_interval_ms)
         self.data_collector = BybitDataCollector()
         self.load_instrument()
+        self.orderbook_depth = 50
+        self.tickerbook = {}
+        self.orderbook = OrderbookCollection("Bybit", book_type=SequencedOrderbook)
+        # "orderbook.50.BTCUSDT" -> "orderbook", pongs and subscription acks carry no topic and are dropped undecoded
+        self.router = TopicRouter("topic", route_key=lambda topic: topic.split(".", 1)[0])
+        self.router.register("orderbook", self._handler_orderbook)
         self._ping_thread = threading.Thread(target=self.send_ping, daemon=True)
-        self.db_client = QuestDBClient(host=QUEST_HOST, port=QUEST_PORT)
+        if start_quest:
+            self.db_client = QuestDBClient(host=QUEST_HOST, port=QUEST_PORT, queue_policy=CONFLATE)
 
     def load_instrument(self):
-        self.instrument_info = self.data_collector.get_contract_details()
+        self.instrument_info = get_contract_details("Bybit")
+        self.instruments = InstrumentRegistry.from_bybit(self.instrument_info)
 
     def disconnect(self):
         pass
 
-    def subscribe(self):
-        setattr(self, "orderbook", OrderbookCollection("Bybit"))
+    def subscribe(self, topic_list: list = None):
         target_inst = ["BTCUSDT", "ETHUSDT", "PENDLEUSDT", "SOLVUSDT","SOLUSDT","GRASSUSDT", "PENDLEUSDT", "XMRUSDT",
                         "SOLVUSDT", "SXTUSDT", "NILUSDT", "DEGENUSDT", "EPTUSDT",
                         "APEUSDT"]  # TODO: load from Redis
+        if topic_list is not None:
+            target_inst = [inst.replace("-", "").upper() for inst in topic_list]
         topic_template = BYBIT_WS_TOPICS["market"]["orderbook"]
         for inst in target_inst:
-            topic = topic_template.format(depth=50, symbol=inst.upper())
+            topic = topic_template.format(depth=self.orderbook_depth, symbol=inst.upper())
             self.orderbook.add_orderbook(inst)
+            self.orderbook.get_orderbook(inst).resync_handler = self._resync_orderbook
             self.client.send({
                 "op": "subscribe",
                 "args": [topic]
-            })
+            }, coalesce="args")
             self.logger.info(f"Subscribed to {topic}")
 
     def unsubscribe(self, topic: str):
@@ -74,45 +88,57 @@ class BybitWSCollector(BaseWSCollector):
     def ping(self):
         self.client.send({"op": "ping"})
 
+    def _resync_orderbook(self, book: SequencedOrderbook):
+        """
+        Resubscribe the orderbook topic so Bybit pushes a fresh snapshot after a sequence gap.
+        """
+        topic = BYBIT_WS_TOPICS["market"]["orderbook"].format(depth=self.orderbook_depth, symbol=book.instrument)
+        self.logger.warning(f"Resyncing {book.instrument} orderbook via {topic}")
+        self.unsubscribe(topic)
+        self.client.send({
+            "op": "subscribe",
+            "args": [topic]
+        })
+
 
     def _handler_orderbook(self, msg):
         data = msg.get("data", {})
         symbol = data.get("s")
         cts = msg.get("cts", 0)
         book = self.orderbook.get_orderbook(symbol)
-        for bids in data.get("b", []):
-            price, size = bids
-            book.insert_order(Order(cts, float(price), float(size), Side.BID))
-
-        for asks in data.get("a", []):
-            price, size = asks
-            book.insert_order(Order(cts, float(price), float(size), Side.ASK))
-
-        bbo = TopOfBook(
-            timestamp=cts,
-            exchange="Bybit",
-            symbol=symbol,
-            bid_price=book.best_bid().price if book.best_bid() else None,
-            bid_qty=book.best_bid().qty if book.best_bid() else None,
-            ask_price=book.best_ask().price if book.best_ask() else None,
-            ask_qty=book.best_ask().qty if book.best_ask() else None
-        )
-        bbo = bbo.to_batch()
-
-
-        self.db_client.batch_write(bbo)
+        update_id = data.get("u", 0)
+        # u == 1 is a snapshot pushed after a Bybit service restart
+        if msg.get("type") == "snapshot" or update_id == 1:
+            book.apply_sequenced_snapshot(data.get("b", []), data.get("a", []), update_id, cts)
+        elif not book.apply_sequenced_delta(data.get("b", []), data.get("a", []), update_id, update_id,
+                                            timestamp=cts):
+            return
+        self.orderbook.publish_book(symbol)
+
+        bid, ask = book.best_bid(), book.best_ask()
+        bbo = self.tickerbook.get(symbol)
+        if bbo is None:
+            bbo = self.tickerbook[symbol] = TopOfBook(0, "Bybit", symbol, None, None, None, None)
+        bbo.update(cts,
+                   bid.price if bid else None, bid.qty if bid else None,
+                   ask.price if ask else None, ask.qty if ask else None)
+        self.conflator.offer(bbo)
 
     def _message_handler(self, raw_msg):
-        msg = json.loads(raw_msg)
-        if "topic" in msg and "orderbook" in msg["topic"]:
-            self._handler_orderbook(msg)
+        self.router.dispatch(raw_msg)
 
-    def run(self):
+    def start(self):
+        """
+        Connect and start handling messages without subscribing to anything.
+        """
         self.load_instrument()
         self.client.register_callback(self._message_handler)
         self.client.start()
         self._ping_thread.start()
         time.sleep(2)
+
+    def run(self):
+        self.start()
         self.subscribe()
 
     def connect(self):
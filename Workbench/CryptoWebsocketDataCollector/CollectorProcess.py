@@ -0,0 +1,64 @@
+import logging
+import multiprocessing
+import time
+
+from Workbench.CryptoWebsocketDataCollector.BinanceWSCollector import BinanceWSCollector
+from Workbench.CryptoWebsocketDataCollector.BybitWSCollector import BybitWSCollector
+from Workbench.CryptoWebsocketDataCollector.HTXWSCollector import HtxWSCollector
+from Workbench.CryptoWebsocketDataCollector.HyperliquidWSCollector import HyperliquidWSCollector
+from Workbench.model.orderbook.SharedTickerbook import SharedTickerbook
+
+logger = logging.getLogger(__name__)
+
+
+COLLECTORS = {
+    "Binance": BinanceWSCollector,
+    "HTX": HtxWSCollector,
+    "Bybit": BybitWSCollector,
+    "Hyperliquid": HyperliquidWSCollector,
+}
+
+
+def _run_collector(exchange: str, symbols: list, shm_name: str):
+    tickerbook = SharedTickerbook(symbols, name=shm_name, create=False)
+    collector = COLLECTORS[exchange](start_quest=False)
+    collector.orderbook.add_listener(tickerbook.on_quote)
+    collector.start()  # not run(), some collectors subscribe a default symbol list there
+    collector.subscribe(symbols)
+    while collector.client.is_running:
+        time.sleep(1)
+    logger.error(f"{exchange} collector connection closed, exiting collector process")
+
+
+class CollectorProcess:
+    """
+    Runs one exchange's WebSocket collector in a child process, which publishes top of book into a SharedTickerbook
+    owned by this (parent) process. Frame decoding and book maintenance then run on another core instead of
+    competing for the parent's GIL.
+    The child is spawned rather than forked, so it starts without the parent's threads, sockets and held locks.
+    """
+
+    def __init__(self, exchange: str, symbols: list):
+        if exchange not in COLLECTORS:
+            raise ValueError("Unknown exchange name: {}".format(exchange))
+        self.exchange = exchange
+        self.symbols = list(symbols)
+        self.tickerbook = SharedTickerbook(self.symbols)
+        self.process = None
+
+    def start(self):
+        logger.info(f"Starting {self.exchange} collector process for {len(self.symbols)} symbols")
+        context = multiprocessing.get_context("spawn")
+        self.process = context.Process(target=_run_collector, args=(self.exchange, self.symbols, self.tickerbook.name),
+                                       name=f"{self.exchange}-collector", daemon=True)
+        self.process.start()
+
+    @property
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def stop(self):
+        if self.is_running:
+            self.process.terminate()
+            self.process.join(5)
+        self.tickerbook.close()
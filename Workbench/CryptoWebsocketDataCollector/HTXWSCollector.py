@@ -2,12 +2,17 @@ from overrides import overrides
 
 from Workbench.config.ConnectionConstant import HTX_FUTURES_WS_URL, QUEST_HOST , QUEST_PORT
 from Workbench.CryptoDataConnector.HTXDataCollector import HTXDataCollector
+from Workbench.CryptoDataConnector.InstrumentCache import get_contract_details
 from Workbench.CryptoWebsocketDataCollector import BaseWSCollector
 from Workbench.model.dto.TopOfBook import TopOfBook
 from Workbench.util.TimeUtil import get_latency_ms
 from Workbench.model.orderbook.BTreeOrderbook import OrderbookCollection, BTreeOrderbook, Order, Side
+from Workbench.model.orderbook.ArrayOrderbook import ArrayOrderbook
+from Workbench.model.InstrumentRegistry import InstrumentRegistry
 from Workbench.transport.QuestClient import QuestDBClient
-from Workbench.util.OrderUtil import decode_gzip_message
+from Workbench.transport.ingest_queue import CONFLATE
+from Workbench.transport.topic_router import TopicRouter
+from Workbench.util.OrderUtil import gunzip
 
 
 HTX_WS_TOPICS = {
@@ -33,21 +38,24 @@ class HtxWSCollector(BaseWSCollector):
     """
     orderbook: OrderbookCollection
 
-    def __init__(self, url=HTX_FUTURES_WS_URL,is_publish=False,start_quest = True):
-        super().__init__("HtxWS", url)
+    def __init__(self, url=HTX_FUTURES_WS_URL,is_publish=False,start_quest = True, conflation_interval_ms: float = None):
+        super().__init__("HtxWS", url, conflation_interval_ms=conflation_interval_ms)
         self.is_publish = is_publish
         self.data_collector = HTXDataCollector()
         self.load_instrument()
         if start_quest:
-            self.db_client = QuestDBClient(host=QUEST_HOST, port=QUEST_PORT)
+            self.db_client = QuestDBClient(host=QUEST_HOST, port=QUEST_PORT, queue_policy=CONFLATE)
         self.tickerbook = {}
+        self.orderbook = OrderbookCollection("HTX", book_type=ArrayOrderbook)
+        self.router = TopicRouter("ch", route_key=self._route_key, fallback=self._handle_control_message)
+        self.router.register("depth", self._handle_depth_message)
+        self.router.register("bbo", lambda msg: self._handle_ticker_message(msg["tick"]))
 
 
     def load_instrument(self):
         self.logger.info("Loading instrument info...")
-        self.instrument_info = self.data_collector.get_contract_details()
-        obj = self.data_collector.get_contract_details()
-        self.instrument_info = obj
+        self.instrument_info = get_contract_details("HTX")
+        self.instruments = InstrumentRegistry.from_htx(self.instrument_info)
 
     def _get_contract_size(self, symbol: str) -> float:
         """
@@ -55,10 +63,7 @@ class HtxWSCollector(BaseWSCollector):
         :param symbol: The trading pair symbol.
         :return: The contract size as a float.
         """
-        if self.instrument_info is not None:
-
-            return self.instrument_info.query("contract_code == @symbol")['contract_size'].values[0]
-        return 1.0
+        return self.instruments.contract_size(symbol, 1.0)
 
     def _handle_depth_message(self, msg):
         """
@@ -75,82 +80,57 @@ class HtxWSCollector(BaseWSCollector):
         cts = msg.get("ts", 0)  # Use the timestamp from the message
 
         conversion = self._get_contract_size(symbol)
-        # Process bids
-        orderbook.clear_bids()
-        orderbook.clear_asks()
-        for bid in tick.get("bids", []):
-            price, size = bid
-            orderbook.insert_order(Order(cts, float(price), float(size)*float(conversion), Side.BID))
-
-        # Process asks
-        for ask in tick.get("asks", []):
-            price, size = ask
-            orderbook.insert_order(Order(cts, float(price), float(size)*float(conversion), Side.ASK))
-
-        bbo = TopOfBook(
-            timestamp=cts,
-            exchange="HTX",
-            symbol=symbol,
-            bid_price=orderbook.best_bid().price if orderbook.best_bid() else None,
-            bid_qty=orderbook.best_bid().qty if orderbook.best_bid() else None,
-            ask_price=orderbook.best_ask().price if orderbook.best_ask() else None,
-            ask_qty=orderbook.best_ask().qty if orderbook.best_ask() else None
-        )
-        symbol =symbol.replace("-", "")
-        self.tickerbook[symbol] = bbo
+        orderbook.apply_snapshot(tick.get("bids", []), tick.get("asks", []), cts, qty_scale=float(conversion))
+
+        bid, ask = orderbook.best_bid(), orderbook.best_ask()
+        bbo = self._top_of_book(symbol)
+        bbo.update(cts,
+                   bid.price if bid else None, bid.qty if bid else None,
+                   ask.price if ask else None, ask.qty if ask else None)
+        self.orderbook.publish_bbo(symbol, cts, bbo.bid_price, bbo.bid_qty, bbo.ask_price, bbo.ask_qty)
         if self.is_publish:
-            self.db_client.batch_write(bbo.to_batch())
+            self.conflator.offer(bbo)
+
+    def _top_of_book(self, symbol: str) -> TopOfBook:
+        # tickerbook is keyed without the dash, e.g. BTCUSDT for BTC-USDT
+        key = symbol.replace("-", "")
+        bbo = self.tickerbook.get(key)
+        if bbo is None:
+            bbo = self.tickerbook[key] = TopOfBook(0, "HTX", symbol, None, None, None, None)
+        return bbo
 
-    def __message_handler(self, msg):
+    def _message_handler(self, msg):
         """
         Handle incoming messages from the WebSocket.
         """
-        msg = decode_gzip_message(msg)
+        self.router.dispatch(gunzip(msg))
+
+    @staticmethod
+    def _route_key(topic: str) -> str:
+        # "market.BTC-USDT.depth.step0" -> "depth", "market.BTC-USDT.bbo" -> "bbo", "orders.BTC-USDT" -> "orders"
+        parts = topic.split(".")
+        return parts[2] if parts[0] == "market" else parts[0]
+
+    def _handle_control_message(self, msg):
         if msg.get("ping"):
             self.ping(msg)
-            return
-        if msg.get("ch"):
-            topic = msg["ch"]
-            if topic.startswith("market") and "depth" in topic:
-                self._handle_depth_message(msg)
-            elif topic.startswith("market") and "bbo" in topic:
-                self._handle_ticker_message(msg['tick'])
-            """
-            elif topic.startswith("market") and "trade" in topic:
-                self.handle_trade_message(msg)
-            elif topic.startswith("market") and "ticker" in topic:
-                self.handle_ticker_message(msg)
-            elif topic.startswith("orders"):
-                self.handle_order_update(msg)
-            elif topic.startswith("accounts"):
-                self.handle_account_update(msg)
-            """
 
     def _handle_ticker_message(self, msg):
         symbol = msg.get("ch").split(".")[1] if "." in msg.get("ch", "") else ""
         bid = msg.get("bid", [None, None])
         ask = msg.get("ask", [None, None])
-        bbo = TopOfBook(
-            timestamp=msg.get("ts", 0),
-            exchange="HTX",
-            symbol=symbol,
-            bid_price=bid[0] if bid else None,
-            bid_qty=bid[1] if bid else None,
-            ask_price=ask[0] if ask else None,
-            ask_qty=ask[1] if ask else None,
-        )
-        symbol =symbol.replace("-", "")
-        self.tickerbook[symbol] = bbo
+        bbo = self._top_of_book(symbol).update(msg.get("ts", 0),
+                                              bid[0] if bid else None, bid[1] if bid else None,
+                                              ask[0] if ask else None, ask[1] if ask else None)
+        self.orderbook.publish_bbo(symbol, bbo.timestamp, bbo.bid_price, bbo.bid_qty, bbo.ask_price, bbo.ask_qty)
         #if self.is_publish:
-        #    self.db_client.batch_write(bbo.to_batch())
+        #    self.conflator.offer(bbo)
 
     def disconnect(self):
         pass
 
 
     def subscribe(self,topic_list=["BTC-USDT"]):
-        setattr(self, "orderbook", OrderbookCollection("HTX"))
-
         topic_template = HTX_WS_TOPICS["market"]['ticker']
         for inst in topic_list:
             topic = topic_template.format(symbol=inst, step=0)
@@ -158,6 +138,17 @@ class HtxWSCollector(BaseWSCollector):
             self.client.send({"sub": topic})
             self.logger.info(f"Subscribed to {topic}")
 
+    def subscribe_depth(self, topic_list: list, step: int = 0):
+        """
+        Subscribe to full depth snapshots, e.g. for depth checks against the orderbook.
+        """
+        topic_template = HTX_WS_TOPICS["market"]['depth']
+        for inst in topic_list:
+            topic = topic_template.format(symbol=inst, step=step)
+            self.orderbook.add_orderbook(inst)
+            self.client.send({"sub": topic})
+            self.logger.info(f"Subscribed to {topic}")
+
     def unsubscribe(self, topic: str):
         pass
 
@@ -165,10 +156,16 @@ class HtxWSCollector(BaseWSCollector):
         self.client.send({"pong": msg["ping"]})
         pass
 
-    def run(self):
-        self.client.register_callback(self.__message_handler)
+    def start(self):
+        """
+        Connect and start handling messages without subscribing to anything.
+        """
+        self.client.register_callback(self._message_handler)
         self.client.start()
 
+    def run(self):
+        self.start()
+
     def connect(self):
         """
         Connect to the HTX WebSocket server.
@@ -1,11 +1,15 @@
-import json
 import time
 from collections import defaultdict, OrderedDict
 from Workbench.CryptoWebsocketDataCollector import BaseWSCollector
 from Workbench.CryptoDataConnector.HyperliquidDataCollector import HyperliquidDataCollector
+from Workbench.CryptoDataConnector.InstrumentCache import get_contract_details
 from Workbench.transport.QuestClient import QuestDBClient
+from Workbench.transport.ingest_queue import CONFLATE
+from Workbench.transport.topic_router import TopicRouter
 from Workbench.model.dto.TopOfBook import TopOfBook
 from Workbench.model.orderbook.BTreeOrderbook import OrderbookCollection
+from Workbench.model.orderbook.ArrayOrderbook import ArrayOrderbook
+from Workbench.model.InstrumentRegistry import InstrumentRegistry
 from Workbench.util.TimeUtil import get_utc_now_ms
 from Workbench.config.ConnectionConstant import HYPERLIQUID_FUTURES_WS_URL, QUEST_HOST, QUEST_PORT
 
@@ -15,18 +19,23 @@ class HyperliquidWSCollector(BaseWSCollector):
     """
     orderbook: OrderbookCollection
 
-    def __init__(self, url=HYPERLIQUID_FUTURES_WS_URL): #deafault URL for Hyperliquid WebSocket
+    def __init__(self, url=HYPERLIQUID_FUTURES_WS_URL, start_quest=True): #deafault URL for Hyperliquid WebSocket
         super().__init__("HyperliquidWS", url)
         self.data_collector = HyperliquidDataCollector()
         self.load_instrument()
         self.last_publish = {}
-        self.db_client = QuestDBClient(host=QUEST_HOST, port=QUEST_PORT)
+        self.orderbook = OrderbookCollection("Hyperliquid", book_type=ArrayOrderbook)
+        self.router = TopicRouter("channel")
+        self.router.register("l2Book", lambda msg: self._handler_l2book(msg["data"]))
+        self.router.register("subscriptionResponse", lambda msg: self.logger.info(f"Subscribing to l2Book for {msg}"))
+        if start_quest:
+            self.db_client = QuestDBClient(host=QUEST_HOST, port=QUEST_PORT, queue_policy=CONFLATE)
 
     def load_instrument(self):
-        self.instrument_info = self.data_collector.get_contract_details()
+        self.instrument_info = get_contract_details("Hyperliquid")
+        self.instruments = InstrumentRegistry.from_hyperliquid(self.instrument_info)
 
     def subscribe(self, topic_list: list = None):
-        setattr(self, "orderbook", OrderbookCollection("Hyperliquid"))
         if topic_list is None:
             topic_list = ["BTC","ETH","SOPH",'SOL']  # default symbols
         for inst in topic_list:
@@ -40,24 +49,26 @@ class HyperliquidWSCollector(BaseWSCollector):
         book = self.orderbook.get_orderbook(symbol)
         level = msg["levels"]
         bids , asks = level[0] , level[1]
-        bids = OrderedDict((float(bid['px']), float(bid['sz'])) for bid in bids)
-        asks = OrderedDict((float(ask['px']), float(ask['sz'])) for ask in asks)
-        book.update_orderbook(bids, asks)
+        book.apply_snapshot([(bid['px'], bid['sz']) for bid in bids],
+                            [(ask['px'], ask['sz']) for ask in asks],
+                            msg.get("time", 0))
+        self.orderbook.publish_book(symbol)
 
 
     def _message_handler(self, msg):
-        msg = json.loads(msg)
+        self.router.dispatch(msg)
 
-        if msg.get("channel") == "l2Book":
-            self._handler_l2book(msg["data"])
-        elif msg.get("channel") == "subscriptionResponse":
-            self.logger.info(f"Subscribing to l2Book for {msg}")
-
-    def run(self):
+    def start(self):
+        """
+        Connect and start handling messages without subscribing to anything.
+        """
         self.load_instrument()
         self.client.register_callback(self._message_handler)
         self.client.start()
         time.sleep(1)
+
+    def run(self):
+        self.start()
         self.subscribe()
 
     def disconnect(self):
@@ -7,6 +7,8 @@ import os
 from Workbench.model.OrderEnum import OrderType, OrderDirection
 from Workbench.model.config.SwapArbConfig import SwapArbConfig
 from Workbench.model.order.Order import Order
+from Workbench.model.orderbook.ConsolidatedBook import ConsolidatedBook
+from Workbench.CryptoWebsocketDataCollector.CollectorProcess import CollectorProcess
 from Workbench.util.PsUtil import kill_process
 from Workbench.transport.redis_client import RedisClient
 from Workbench.model.position.SwapPosition import SwapPosition , SwapPositionBook
@@ -27,8 +29,24 @@ class SwapArbStrategyBot(BaseBot):
         self.logger.info("Initializing SwapArbStrategyBot...")
         self.event_dict = {}
         self.last_trade_ts = {}
-        self.init_market_collector(self.bot_config.exchange_a)
-        self.init_market_collector(self.bot_config.exchange_b)
+        self.consolidated_book = ConsolidatedBook()
+        self.collector_process = {}
+        self._market_data_subscribed = False
+        self._depth_subscribed = False
+        self._depth_missing = set()  # symbols whose depth check was skipped for lack of a book, logged once
+        if self.bot_config.is_multiprocess:
+            if self.bot_config.is_depth_check:
+                raise ValueError("is_depth_check needs the orderbooks in-process, disable is_multiprocess to use it.")
+            # quotes arrive through shared memory and are fed into the consolidated book by cal()
+            self.collector_process[self.bot_config.exchange_a] = CollectorProcess(self.bot_config.exchange_a,
+                                                                                  self.bot_config.exchange_a_market_list)
+            self.collector_process[self.bot_config.exchange_b] = CollectorProcess(self.bot_config.exchange_b,
+                                                                                  self.bot_config.exchange_b_market_list)
+        else:
+            self.init_market_collector(self.bot_config.exchange_a)
+            self.init_market_collector(self.bot_config.exchange_b)
+            self.consolidated_book.add_venue(self.market_connector[self.bot_config.exchange_a].orderbook)
+            self.consolidated_book.add_venue(self.market_connector[self.bot_config.exchange_b].orderbook)
         self.trader_client_a = BinanceCryptoTrader(name=self.bot_config.exchange_a)
         self.trader_client_b = HTXCryptoTrader(name=self.bot_config.exchange_b)
         try:
@@ -117,8 +135,12 @@ class SwapArbStrategyBot(BaseBot):
     def init_bot(self):
         for key, exchange in self.market_connector.items():
             self.logger.info(f'Initializing exchange: {key}')
-            exchange.run()
-        self.subscribe_market_data()
+            exchange.start()  # subscribe_market_data subscribes the configured lists only
+        for key, process in self.collector_process.items():
+            self.logger.info(f'Starting collector process: {key}')
+            process.start()
+        if not self.collector_process:
+            self.subscribe_market_data()
         self.position_thread = threading.Thread(target=self.__publish_position, daemon=True).start()
         time.sleep(0.5)
         self.run()
@@ -132,6 +154,24 @@ class SwapArbStrategyBot(BaseBot):
         self.market_connector[self.bot_config.exchange_a].subscribe(self.bot_config.exchange_a_market_list)
         time.sleep(1)
         self.market_connector[self.bot_config.exchange_b].subscribe(self.bot_config.exchange_b_market_list)
+        self._market_data_subscribed = True
+        self._subscribe_depth()
+
+    def _subscribe_depth(self):
+        """
+        Subscribe the depth books once is_depth_check is on, at startup or when a config reload turns it on.
+        """
+        if not self.bot_config.is_depth_check or self._depth_subscribed:
+            return
+        self.market_connector[self.bot_config.exchange_a].subscribe_depth(self.bot_config.exchange_a_market_list)
+        self.market_connector[self.bot_config.exchange_b].subscribe_depth(self.bot_config.exchange_b_market_list)
+        self._depth_subscribed = True
+
+    def reload_config(self):
+        super().reload_config()
+        # BaseBot.__init__ reloads before the connectors exist, subscribe_market_data covers that case
+        if getattr(self, "_market_data_subscribed", False) and not self.collector_process:
+            self._subscribe_depth()
 
     def run(self):
         self.logger.info('Sleep 10 seconds to load all position data')
@@ -144,9 +184,14 @@ class SwapArbStrategyBot(BaseBot):
                 self.logger.error(f"Error in SwapArbStrategyBot: {e}")
                 time.sleep(5)
 
+    def _is_market_data_running(self, exchange: str) -> bool:
+        if exchange in self.collector_process:
+            return self.collector_process[exchange].is_running
+        return self.market_connector[exchange].client.is_running
+
     def check_connection(self):
-        if self.market_connector[self.bot_config.exchange_a].client.is_running and \
-                self.market_connector[self.bot_config.exchange_b].client.is_running:
+        if self._is_market_data_running(self.bot_config.exchange_a) and \
+                self._is_market_data_running(self.bot_config.exchange_b):
             pass
         else:
             self.logger.error("One of the exchanges is not active. killing the bot...")
@@ -247,107 +292,163 @@ class SwapArbStrategyBot(BaseBot):
 
 
 
+    def _check_depth(self, symbol: str, spread_bp: float) -> bool:
+        """
+        Walk max_trade_size_usd through both orderbooks and check the VWAP spread still clears the entry bound.
+        Passes without checking while either depth book is not there yet, e.g. just after is_depth_check was turned on.
+        """
+        connector_a = self.market_connector.get(self.bot_config.exchange_a)
+        connector_b = self.market_connector.get(self.bot_config.exchange_b)
+        book_a = connector_a.orderbook.get_orderbook(symbol) if connector_a else None
+        book_b = connector_b.orderbook.get_orderbook(symbol.replace("USDT", "-USDT")) if connector_b else None
+        if book_a is None or book_b is None:
+            if symbol not in self._depth_missing:
+                self._depth_missing.add(symbol)
+                self.logger.warning(f"No depth book for {symbol} yet, skipping the depth check")
+            return True
+        self._depth_missing.discard(symbol)
+        size = self.bot_config.max_trade_size_usd
+        if spread_bp > 0:
+            fill_a = book_a.estimate_fill(OrderDirection.SELL, notional=size)
+            fill_b = book_b.estimate_fill(OrderDirection.BUY, notional=size)
+        else:
+            fill_a = book_a.estimate_fill(OrderDirection.BUY, notional=size)
+            fill_b = book_b.estimate_fill(OrderDirection.SELL, notional=size)
+        if fill_a is None or fill_b is None or not (fill_a.is_complete and fill_b.is_complete):
+            return False
+        vwap_spread_bp = (fill_a.vwap - fill_b.vwap) / fill_b.vwap * 10000
+        if spread_bp < 0:
+            vwap_spread_bp = -vwap_spread_bp
+        return vwap_spread_bp > self.bot_config.upper_bound_entry_bp
+
     def cal_quantity(self, symbol: str, price: float, notional: float) -> (float, float):
         a_qty = self.trader_client_a.get_order_size(symbol, notional,price)
         b_qty = self.trader_client_b.get_order_size(symbol, notional,price)
         return (float(trim_trailing_zeros(a_qty)), float(trim_trailing_zeros(b_qty)))
 
+    def _poll_shared_tickerbooks(self):
+        """
+        Copy quotes the collector processes wrote since the last pass into the consolidated book.
+        """
+        for exchange, process in self.collector_process.items():
+            for symbol, ts, bid_price, bid_qty, ask_price, ask_qty in process.tickerbook.read_updated():
+                self.consolidated_book.on_quote(exchange, symbol, ts, bid_price, bid_qty, ask_price, ask_qty)
+
     def cal(self):
         self.check_connection()
-        bbo_a = self.market_connector[self.bot_config.exchange_a].tickerbook
-        bbo_b = self.market_connector[self.bot_config.exchange_b].tickerbook
         self._check_position_unwind()
-        for symbol in bbo_a.keys():
-            if symbol not in bbo_b:
-                continue
+        if self.collector_process:
+            self._poll_shared_tickerbooks()
+        # only symbols whose quotes changed since the last pass need re-evaluating, crossed symbols that were
+        # skipped and symbols left over by an exception are queued again for the next pass
+        updated = list(self.consolidated_book.pop_updated())
+        retry = set()
+        index = 0
+        try:
+            for index, base in enumerate(updated):
+                quote_a = self.consolidated_book.get_quote(base, self.bot_config.exchange_a)
+                quote_b = self.consolidated_book.get_quote(base, self.bot_config.exchange_b)
+                if quote_a is None or quote_b is None:
+                    continue
+                symbol = quote_a.symbol.replace('-', '')
+
+                bid_a = quote_a.bid_price
+                ask_b = quote_b.ask_price
+                bid_b = quote_b.bid_price
+                ask_a = quote_a.ask_price
+
+                spread_bp = self.consolidated_book.get_spread_bp(base, self.bot_config.exchange_a,
+                                                                 self.bot_config.exchange_b) or 0
+                self.spread_book[symbol] = spread_bp
+
+                if abs(spread_bp) > self.bot_config.upper_bound_entry_bp:
+                    retry.add(base)  # stays queued while crossed until an entry goes through
+                    now = get_timestamp()
+                    cooldown_ms = 2000
+
+                    if now - self.event_dict.get(symbol, 0) > 10 or symbol not in self.event_dict:
+                        bo_spread_a = (ask_a-bid_a)/ask_a * 10000
+                        bo_spread_b = (ask_b-bid_b)/ask_b * 10000
+                        #check bo spread
+                        if bo_spread_a > self.bot_config.depth_threshold or bo_spread_b > self.bot_config.depth_threshold:
+                            continue
+                        self.logger.info(f"Arbitrage opportunity found for {symbol}: "
+                                         f"Bid on {self.bot_config.exchange_a}: {bid_a}, "
+                                         f"Ask on {self.bot_config.exchange_b}: {ask_b}, "
+                                         f"Spread: {spread_bp:.2f}\n"
+                                         f'A BO:{bo_spread_a:.2f} | B BO:{bo_spread_b:.2f} @ {get_now_hkt_string()}')
 
-            bid_a = bbo_a[symbol].bid_price
-            ask_b = bbo_b[symbol].ask_price
-            bid_b = bbo_b[symbol].bid_price
-            ask_a = bbo_a[symbol].ask_price
 
-            spread_bp = (bid_a - ask_b) / ask_b * 10000 if ask_b != 0 else 0
-            self.spread_book[symbol] = spread_bp
 
-            if abs(spread_bp) > self.bot_config.upper_bound_entry_bp:
-                now = get_timestamp()
-                cooldown_ms = 2000
+                        self.event_dict[symbol] = now
 
-                if now - self.event_dict.get(symbol, 0) > 10 or symbol not in self.event_dict:
-                    bo_spread_a = (ask_a-bid_a)/ask_a * 10000
-                    bo_spread_b = (ask_b-bid_b)/ask_b * 10000
-                    #check bo spread
-                    if bo_spread_a > self.bot_config.depth_threshold or bo_spread_b > self.bot_config.depth_threshold:
+                    if not self.bot_config.is_trading:
                         continue
-                    self.logger.info(f"Arbitrage opportunity found for {symbol}: "
-                                     f"Bid on {self.bot_config.exchange_a}: {bid_a}, "
-                                     f"Ask on {self.bot_config.exchange_b}: {ask_b}, "
-                                     f"Spread: {spread_bp:.2f}\n"
-                                     f'A BO:{bo_spread_a:.2f} | B BO:{bo_spread_b:.2f} @ {get_now_hkt_string()}')
-
-
-
-                    self.event_dict[symbol] = now
-
-                if not self.bot_config.is_trading:
-                    continue
-                if symbol in self.swap_position_book.positions.keys():
-                    continue
-                #Hot logic
-
-                with self.entry_lock:
-                    self.last_trade_ts[symbol] = get_timestamp()
-                    try:
-                        order_qty = self.cal_quantity(symbol, bid_a, self.bot_config.max_trade_size_usd)
-                        self.logger.info(f"Calculated order quantity for {symbol}: {order_qty}")
-                        if order_qty[0] == 0 or order_qty[1] == 0:
-                            self.logger.warning(f"Order quantity for {symbol} is zero, skipping...")
-                            continue
-                        if symbol in self.working_pair:
-                            continue
-                        if spread_bp > 0:
-                            order_a = Order(
-                                exchange=self.bot_config.exchange_a,
-                                symbol=symbol,
-                                direction=OrderDirection.SELL,
-                                order_type=OrderType.MARKET,
-                                quantity=order_qty[0],
-                                is_market_order=True
-                            )
-                            order_b = Order(
-                                exchange=self.bot_config.exchange_b,
-                                symbol=symbol.replace("USDT", "-USDT"),
-                                direction=OrderDirection.BUY,
-                                order_type=OrderType.MARKET,
-                                quantity=order_qty[1],
-                            )
-                        else:
-                            order_a = Order(
-                                exchange="Binance",
-                                symbol=symbol,
-                                direction=OrderDirection.BUY,
-                                order_type=OrderType.MARKET,
-                                quantity=order_qty[0],
-                                is_market_order=True
-                            )
-                            order_b = Order(
-                                exchange="HTX",
-                                symbol=symbol.replace("USDT", "-USDT"),
-                                direction=OrderDirection.SELL,
-                                order_type=OrderType.MARKET,
-                                quantity=order_qty[1],
-                            )
-
-                        self.trader_client_a.ws_place_order(order_a)
-                        self.trader_client_b.ws_place_order(order_b)
-                        self.send_message(
-                            "Calculated order quantity for {}: {} @ {}".format(symbol, order_qty, get_now_hkt_string()))
-                        time.sleep(1)
-                    except Exception as e:
-                        self.logger.error(f"Error in SwapArbStrategyBot: {e}")
-
-            else:
-                pass
+                    if symbol in self.swap_position_book.positions.keys():
+                        continue
+                    if self.bot_config.is_depth_check and not self._check_depth(symbol, spread_bp):
+                        continue
+                    #Hot logic
+
+                    with self.entry_lock:
+                        self.last_trade_ts[symbol] = get_timestamp()
+                        try:
+                            order_qty = self.cal_quantity(symbol, bid_a, self.bot_config.max_trade_size_usd)
+                            self.logger.info(f"Calculated order quantity for {symbol}: {order_qty}")
+                            if order_qty[0] == 0 or order_qty[1] == 0:
+                                self.logger.warning(f"Order quantity for {symbol} is zero, skipping...")
+                                continue
+                            if symbol in self.working_pair:
+                                continue
+                            if spread_bp > 0:
+                                order_a = Order(
+                                    exchange=self.bot_config.exchange_a,
+                                    symbol=symbol,
+                                    direction=OrderDirection.SELL,
+                                    order_type=OrderType.MARKET,
+                                    quantity=order_qty[0],
+                                    is_market_order=True
+                                )
+                                order_b = Order(
+                                    exchange=self.bot_config.exchange_b,
+                                    symbol=symbol.replace("USDT", "-USDT"),
+                                    direction=OrderDirection.BUY,
+                                    order_type=OrderType.MARKET,
+                                    quantity=order_qty[1],
+                                )
+                            else:
+                                order_a = Order(
+                                    exchange="Binance",
+                                    symbol=symbol,
+                                    direction=OrderDirection.BUY,
+                                    order_type=OrderType.MARKET,
+                                    quantity=order_qty[0],
+                                    is_market_order=True
+                                )
+                                order_b = Order(
+                                    exchange="HTX",
+                                    symbol=symbol.replace("USDT", "-USDT"),
+                                    direction=OrderDirection.SELL,
+                                    order_type=OrderType.MARKET,
+                                    quantity=order_qty[1],
+                                )
+
+                            self.trader_client_a.ws_place_order(order_a)
+                            self.trader_client_b.ws_place_order(order_b)
+                            retry.discard(base)
+                            self.send_message(
+                                "Calculated order quantity for {}: {} @ {}".format(symbol, order_qty, get_now_hkt_string()))
+                            time.sleep(1)
+                        except Exception as e:
+                            self.logger.error(f"Error in SwapArbStrategyBot: {e}")
+
+                else:
+                    pass
+            index = len(updated)
+        finally:
+            retry.update(updated[index:])
+            if retry:
+                self.consolidated_book.mark_updated(retry)
 
 
 if __name__ == "__main__":
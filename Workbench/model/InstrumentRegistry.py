@@ -0,0 +1,158 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+@dataclass
+class InstrumentSpec:
+    exchange: str
+    symbol: str  # venue symbol, e.g. BTC-USDT on HTX
+    contract_size: float = 1.0  # base units per contract
+    tick_size: float = None
+    lot_size: float = None  # quantity step
+    min_qty: float = None
+    base_asset: str = None
+    quote_asset: str = None
+
+
+def _float(value, default=None):
+    try:
+        return float(value) if value is not None and value != "" else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _records(df) -> list:
+    if df is None:
+        return []
+    if isinstance(df, pd.DataFrame):
+        return df.to_dict("records")
+    return list(df)
+
+
+class InstrumentRegistry:
+    """
+    Per-venue instrument metadata keyed by symbol, built once from the contract-details download so the hot path
+    does a dict lookup instead of a DataFrame filter. Symbols also resolve through aliases, by default the
+    upper-case form with `-`/`_` removed, so `BTC-USDT`, `BTCUSDT` and `btcusdt` find the same spec.
+    """
+
+    def __init__(self, exchange: str):
+        self.exchange = exchange
+        self.specs = {}  # symbol -> InstrumentSpec
+        self._aliases = {}  # alias -> symbol
+
+    def add(self, spec: InstrumentSpec, aliases: tuple = ()):
+        self.specs[spec.symbol] = spec
+        compact = spec.symbol.upper().replace("-", "").replace("_", "")
+        for alias in (compact, compact.lower(), *aliases):
+            self._aliases.setdefault(alias, spec.symbol)
+
+    def get(self, symbol: str):
+        spec = self.specs.get(symbol)
+        if spec is None:
+            alias = self._aliases.get(symbol)
+            spec = self.specs.get(alias) if alias is not None else None
+        return spec
+
+    def contract_size(self, symbol: str, default: float = 1.0) -> float:
+        spec = self.get(symbol)
+        return spec.contract_size if spec is not None else default
+
+    def tick_size(self, symbol: str, default: float = None) -> float:
+        spec = self.get(symbol)
+        return spec.tick_size if spec is not None and spec.tick_size is not None else default
+
+    def lot_size(self, symbol: str, default: float = None) -> float:
+        spec = self.get(symbol)
+        return spec.lot_size if spec is not None and spec.lot_size is not None else default
+
+    def symbols(self) -> list:
+        return list(self.specs)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.get(symbol) is not None
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    @classmethod
+    def from_binance(cls, contract_info) -> "InstrumentRegistry":
+        """
+        :param contract_info: `exchangeInfo` symbols, as returned by BinanceDataCollector.get_contract_details.
+        """
+        registry = cls("Binance")
+        for row in _records(contract_info):
+            filters = {f.get("filterType"): f for f in row.get("filters") or []}
+            registry.add(InstrumentSpec(
+                exchange="Binance",
+                symbol=row["symbol"],
+                contract_size=_float(row.get("contractSize"), 1.0),
+                tick_size=_float(filters.get("PRICE_FILTER", {}).get("tickSize")),
+                lot_size=_float(filters.get("LOT_SIZE", {}).get("stepSize")),
+                min_qty=_float(filters.get("LOT_SIZE", {}).get("minQty")),
+                base_asset=row.get("baseAsset"),
+                quote_asset=row.get("quoteAsset"),
+            ))
+        return registry
+
+    @classmethod
+    def from_htx(cls, contract_info) -> "InstrumentRegistry":
+        """
+        :param contract_info: `swap_contract_info` rows, as returned by HTXDataCollector.get_contract_details.
+        HTX trades whole contracts, so lot size and min qty are one contract.
+        """
+        registry = cls("HTX")
+        for row in _records(contract_info):
+            registry.add(InstrumentSpec(
+                exchange="HTX",
+                symbol=row["contract_code"],
+                contract_size=_float(row.get("contract_size"), 1.0),
+                tick_size=_float(row.get("price_tick")),
+                lot_size=1.0,
+                min_qty=1.0,
+                base_asset=row.get("symbol"),
+                quote_asset=row.get("trade_partition"),
+            ))
+        return registry
+
+    @classmethod
+    def from_bybit(cls, contract_info) -> "InstrumentRegistry":
+        """
+        :param contract_info: `instruments-info` rows, as returned by BybitDataCollector.get_contract_details.
+        """
+        registry = cls("Bybit")
+        for row in _records(contract_info):
+            price_filter = row.get("priceFilter") or {}
+            lot_filter = row.get("lotSizeFilter") or {}
+            registry.add(InstrumentSpec(
+                exchange="Bybit",
+                symbol=row["symbol"],
+                tick_size=_float(price_filter.get("tickSize")),
+                lot_size=_float(lot_filter.get("qtyStep")),
+                min_qty=_float(lot_filter.get("minOrderQty")),
+                base_asset=row.get("baseCoin"),
+                quote_asset=row.get("quoteCoin"),
+            ))
+        return registry
+
+    @classmethod
+    def from_hyperliquid(cls, meta) -> "InstrumentRegistry":
+        """
+        :param meta: `metaAndAssetCtxs` response, as returned by HyperliquidDataCollector.get_contract_details.
+        Hyperliquid prices are quoted to 5 significant figures rather than a fixed tick, so tick size is left unset.
+        """
+        registry = cls("Hyperliquid")
+        universe = meta[0].get("universe", []) if meta else []
+        for asset in universe:
+            sz_decimals = asset.get("szDecimals")
+            lot_size = 10 ** -sz_decimals if sz_decimals is not None else None
+            registry.add(InstrumentSpec(
+                exchange="Hyperliquid",
+                symbol=asset["name"],
+                lot_size=lot_size,
+                min_qty=lot_size,
+                base_asset=asset["name"],
+                quote_asset="USDC",
+            ))
+        return registry
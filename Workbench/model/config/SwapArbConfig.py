@@ -22,6 +22,7 @@ class SwapArbConfig:
     max_position: int  # 3 allow 3 swap positions
     is_depth_check: bool  # check the depth of the order book before placing orders
     depth_threshold:int
+    is_multiprocess: bool = False  # run each market data collector in its own process, quotes via shared memory
     def to_dict(self):
         return {
             "is_trading": self.is_trading,
@@ -38,7 +39,8 @@ class SwapArbConfig:
             "max_position": self.max_position,
             "position_leverage": self.position_leverage,
             "is_depth_check": self.is_depth_check,
-            "depth_threshold": self.depth_threshold
+            "depth_threshold": self.depth_threshold,
+            "is_multiprocess": self.is_multiprocess
         }
 
     @staticmethod
@@ -1,8 +1,16 @@
 from dataclasses import dataclass
-from Workbench.transport.QuestClient import QuestBatch
+from Workbench.transport.QuestClient import QuestBatch, QuestRowLayout
 from datetime import datetime
-@dataclass
+
+TOP_OF_BOOK_LAYOUT = QuestRowLayout("top_of_book", ("symbol", "exchange"), ("bid_price", "bid_qty", "ask_price", "ask_qty"))
+
+
+@dataclass(slots=True)
 class TopOfBook:
+    """
+    Collectors keep one instance per symbol and update it in place, use to_row() with TOP_OF_BOOK_LAYOUT to
+    hand an immutable copy to QuestDBClient.batch_write_row.
+    """
     timestamp: int
     exchange: str
     symbol: str
@@ -11,6 +19,17 @@ class TopOfBook:
     ask_price: float
     ask_qty: float
 
+    def update(self, timestamp: int, bid_price: float, bid_qty: float, ask_price: float, ask_qty: float):
+        self.timestamp = timestamp
+        self.bid_price = bid_price
+        self.bid_qty = bid_qty
+        self.ask_price = ask_price
+        self.ask_qty = ask_qty
+        return self
+
+    def to_row(self) -> tuple:
+        return (self.timestamp, self.symbol, self.exchange, self.bid_price, self.bid_qty, self.ask_price, self.ask_qty)
+
     def to_tuple(self):
         return (self.timestamp, self.exchange, self.symbol, self.bid_price, self.bid_qty, self.ask_price, self.ask_qty)
 
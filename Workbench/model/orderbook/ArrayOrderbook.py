@@ -0,0 +1,289 @@
+import bisect
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from Workbench.model.OrderEnum import OrderDirection
+from Workbench.model.orderbook.BTreeOrderbook import Order, Side
+
+DEFAULT_CAPACITY = 64
+
+
+@dataclass
+class FillEstimate:
+    """
+    Result of walking a size through one side of the book.
+    """
+    qty: float
+    notional: float
+    vwap: float
+    worst_price: float
+    is_complete: bool  # False if the visible book could not fill the full size
+
+
+class PriceLadder:
+    """
+    One side of an orderbook stored as a sorted (capacity, 2) float64 array of [price, qty], best level first.
+    A parallel list of sort keys (price for asks, -price for bids) is bisected so a level update is an
+    O(log n) search plus an in-place shift of the rows behind it.
+    Cumulative qty/notional arrays from the best level outwards are rebuilt lazily on the first depth
+    query after an update, so depth, cost-to-fill and VWAP queries are binary searches.
+    """
+
+    def __init__(self, side: Side, capacity: int = DEFAULT_CAPACITY):
+        self.side = side
+        self._sign = -1.0 if side == Side.BID else 1.0
+        self.levels = np.zeros((capacity, 2), dtype=np.float64)
+        self.keys = []
+        self._depth = None  # (prices, cum_qty, cum_notional), rebuilt after an update
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _grow(self):
+        n = len(self.keys)
+        levels = np.zeros((self.levels.shape[0] * 2, 2), dtype=np.float64)
+        levels[:n] = self.levels[:n]
+        self.levels = levels
+
+    def update(self, price: float, qty: float):
+        """
+        Set the quantity resting at a price level, a zero quantity removes the level.
+        """
+        key = price * self._sign
+        keys = self.keys
+        levels = self.levels
+        n = len(keys)
+        self._depth = None
+        i = bisect.bisect_left(keys, key)
+        if i < n and keys[i] == key:
+            if qty == 0.0:
+                del keys[i]
+                levels[i:n - 1] = levels[i + 1:n]
+                levels[n - 1] = 0.0
+            else:
+                levels[i, 1] = qty
+        elif qty != 0.0:
+            if n == levels.shape[0]:
+                self._grow()
+                levels = self.levels
+            keys.insert(i, key)
+            levels[i + 1:n + 1] = levels[i:n]
+            levels[i, 0] = price
+            levels[i, 1] = qty
+        self._depth = None  # again, in case a reader rebuilt from the rows while they were being shifted
+
+    def reserve(self, capacity: int):
+        while self.levels.shape[0] < capacity:
+            self._grow()
+
+    def load(self, levels, qty_scale: float = 1.0):
+        """
+        Replace the whole side with raw [price, qty] rows in one pass.
+        :param levels: list of [price, qty] pairs (str or float) or an (n, 2) array.
+        :param qty_scale: multiplier applied to every qty, e.g. a contract size.
+        """
+        rows = np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+        if qty_scale != 1.0:
+            rows = rows * (1.0, qty_scale)
+        rows = rows[rows[:, 1] != 0.0]
+        rows = rows[np.argsort(rows[:, 0] * self._sign, kind="stable")]
+        n = len(rows)
+        old_n = len(self.keys)
+        self.reserve(n)
+        self.levels[:n] = rows
+        if old_n > n:
+            self.levels[n:old_n] = 0.0
+        self.keys = (rows[:, 0] * self._sign).tolist()
+        self._depth = None
+
+    def best(self):
+        if not self.keys:
+            return None
+        return float(self.levels[0, 0]), float(self.levels[0, 1])
+
+    def count_within(self, cutoff: float) -> int:
+        """
+        Number of levels priced at or better than the cutoff price.
+        """
+        return bisect.bisect_right(self.keys, cutoff * self._sign)
+
+    def qty_within(self, cutoff: float) -> float:
+        prices, cum_qty, _ = self._depth_index()
+        count = self._count_in(prices, cutoff)
+        return float(cum_qty[count - 1]) if count else 0.0
+
+    def items(self):
+        n = len(self.keys)
+        return [(float(price), float(qty)) for price, qty in self.levels[:n]]
+
+    def clear(self):
+        self.levels[:len(self.keys)] = 0.0
+        self.keys.clear()
+        self._depth = None
+
+    def _depth_index(self):
+        """
+        (prices, cum_qty, cum_notional) arrays built from one copy of the levels, returned from locals so a reader on
+        another thread than the one applying updates always gets a complete, self-consistent tuple even if an
+        update invalidates it meanwhile.
+        """
+        depth = self._depth
+        if depth is None:
+            rows = self.levels[:len(self.keys)].copy()
+            depth = (rows[:, 0], np.cumsum(rows[:, 1]), np.cumsum(rows[:, 0] * rows[:, 1]))
+            self._depth = depth
+        return depth
+
+    def notional_within(self, cutoff: float) -> float:
+        prices, _, cum_notional = self._depth_index()
+        count = self._count_in(prices, cutoff)
+        return float(cum_notional[count - 1]) if count else 0.0
+
+    def _count_in(self, prices, cutoff: float) -> int:
+        # count_within against the depth snapshot rather than the live keys
+        return int(np.searchsorted(prices * self._sign, cutoff * self._sign, side="right"))
+
+    def fill_qty(self, qty: float):
+        """
+        Walk a base quantity from the best level outwards.
+        """
+        return self._fill(*self._depth_index(), qty, by_notional=False)
+
+    def fill_notional(self, notional: float):
+        """
+        Walk a quote (USD) notional from the best level outwards.
+        """
+        return self._fill(*self._depth_index(), notional, by_notional=True)
+
+    @staticmethod
+    def _fill(prices, cum_qty, cum_notional, size: float, by_notional: bool):
+        n = len(cum_qty)
+        if n == 0 or size <= 0:
+            return None
+        i = int(np.searchsorted(cum_notional if by_notional else cum_qty, size, side="left"))
+        if i >= n:
+            qty, notional = float(cum_qty[-1]), float(cum_notional[-1])
+            return FillEstimate(qty, notional, notional / qty, float(prices[n - 1]), False)
+        price = float(prices[i])
+        prev_qty = float(cum_qty[i - 1]) if i else 0.0
+        prev_notional = float(cum_notional[i - 1]) if i else 0.0
+        if by_notional:
+            notional = float(size)
+            qty = prev_qty + (size - prev_notional) / price
+        else:
+            qty = float(size)
+            notional = prev_notional + (size - prev_qty) * price
+        return FillEstimate(qty, notional, notional / qty, price, True)
+
+
+class ArrayOrderbook:
+    """
+    Drop-in replacement for BTreeOrderbook backed by sorted price/qty arrays.
+    Level updates cost O(log n) instead of a full re-sort and best bid/ask are read from row 0 in O(1).
+    """
+
+    def __init__(self, instrument: str,
+                 compare_and_swap: bool = False,
+                 capacity: int = DEFAULT_CAPACITY):
+        self.instrument = instrument
+        self.compare_and_swap = compare_and_swap
+        self.timestamp = 0
+        self.bids = PriceLadder(Side.BID, capacity)  # descending prices
+        self.asks = PriceLadder(Side.ASK, capacity)  # ascending prices
+
+    def insert_order(self, order: Order):
+        book = self.bids if order.side == Side.BID else self.asks
+        book.update(order.price, order.qty)
+        self.timestamp = order.timestamp
+
+    def best_bid(self):
+        level = self.bids.best()
+        return Order(self.timestamp, level[0], level[1], Side.BID) if level else None
+
+    def best_ask(self):
+        level = self.asks.best()
+        return Order(self.timestamp, level[0], level[1], Side.ASK) if level else None
+
+    def get_levels(self, side: Side, depth: int) -> np.ndarray:
+        """
+        Zero-copy (depth, 2) float64 view of [price, qty] rows, best level first and zero padded.
+        The view tracks the live book (until the side outgrows its capacity), copy it to keep a frozen snapshot.
+        """
+        ladder = self.bids if side == Side.BID else self.asks
+        ladder.reserve(depth)
+        return ladder.levels[:depth]
+
+    def get_bo_spread_in_bp(self):
+        bid = self.bids.best()
+        ask = self.asks.best()
+        if bid and ask:
+            mid = (bid[0] + ask[0]) / 2.0
+            return (ask[0] - bid[0]) / mid * 10_000.0 if mid > 0 else None
+        return None
+
+    def get_depth_by_pct(self, pct: float):
+        bid = self.bids.best()
+        ask = self.asks.best()
+        if not bid or not ask:
+            return 0.0, 0.0
+
+        mid = (bid[0] + ask[0]) / 2.0
+        threshold = mid * (pct / 100.0)
+        return self.bids.qty_within(mid - threshold), self.asks.qty_within(mid + threshold)
+
+    def get_depth_by_bps(self, bps: float):
+        return self.get_depth_by_pct(bps / 100.0)
+
+    def get_notional_depth_by_bps(self, bps: float):
+        """
+        Quote notional resting within bps of mid on each side.
+        """
+        bid = self.bids.best()
+        ask = self.asks.best()
+        if not bid or not ask:
+            return 0.0, 0.0
+
+        mid = (bid[0] + ask[0]) / 2.0
+        threshold = mid * bps / 10_000.0
+        return self.bids.notional_within(mid - threshold), self.asks.notional_within(mid + threshold)
+
+    def estimate_fill(self, direction: OrderDirection, notional: float = None, qty: float = None):
+        """
+        Estimate a market order's VWAP and worst price against the visible book.
+        A buy walks the asks and a sell walks the bids; pass either a quote notional or a base qty.
+        :return: FillEstimate, or None if that side is empty.
+        """
+        ladder = self.asks if direction == OrderDirection.BUY else self.bids
+        if notional is not None:
+            return ladder.fill_notional(notional)
+        return ladder.fill_qty(qty)
+
+    def clear_bids(self):
+        self.bids.clear()
+
+    def clear_asks(self):
+        self.asks.clear()
+
+    def apply_snapshot(self, bids, asks, timestamp: int = 0, qty_scale: float = 1.0):
+        """
+        Replace both sides with raw [price, size] levels straight from the parsed message.
+        """
+        self.bids.load(bids, qty_scale)
+        self.asks.load(asks, qty_scale)
+        self.timestamp = timestamp
+
+    def apply_delta(self, bids, asks, timestamp: int = 0, qty_scale: float = 1.0):
+        """
+        Apply raw [price, size] level changes, a zero size removes the level.
+        """
+        for price, qty in bids:
+            self.bids.update(float(price), float(qty) * qty_scale)
+        for price, qty in asks:
+            self.asks.update(float(price), float(qty) * qty_scale)
+        self.timestamp = timestamp
+
+    def update_orderbook(self, new_bids: OrderedDict, new_asks: OrderedDict):
+        if self.compare_and_swap:
+            self.apply_snapshot(list(new_bids.items()), list(new_asks.items()), self.timestamp)
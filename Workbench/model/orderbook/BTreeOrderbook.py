@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from enum import Enum
 from collections import defaultdict, OrderedDict
 import bisect
+import numpy as np
 
 
 class Side(str, Enum):
@@ -47,6 +48,18 @@ class BTreeOrderbook:
     def best_ask(self):
         return next(iter(self.asks.values()), [None])[0]
 
+    def get_levels(self, side: Side, depth: int) -> np.ndarray:
+        """
+        (depth, 2) float64 array of [price, qty] rows, best level first and zero padded.
+        """
+        book = self.bids if side == Side.BID else self.asks
+        levels = np.zeros((depth, 2), dtype=np.float64)
+        for i, (price, orders) in enumerate(book.items()):
+            if i == depth:
+                break
+            levels[i] = price, sum(order.qty for order in orders)
+        return levels
+
     def get_bo_spread_in_bp(self):
         bid = self.best_bid()
         ask = self.best_ask()
@@ -86,6 +99,30 @@ class BTreeOrderbook:
     def clear_asks(self):
         self.asks.clear()
 
+    def apply_snapshot(self, bids, asks, timestamp: int = 0, qty_scale: float = 1.0):
+        """
+        Replace both sides with raw [price, size] levels straight from the parsed message.
+        """
+        self.bids.clear()
+        self.asks.clear()
+        self.apply_delta(bids, asks, timestamp, qty_scale)
+
+    def apply_delta(self, bids, asks, timestamp: int = 0, qty_scale: float = 1.0):
+        """
+        Apply raw [price, size] level changes and re-sort each touched side once.
+        """
+        for side, book, levels in ((Side.BID, self.bids, bids), (Side.ASK, self.asks, asks)):
+            if len(levels) == 0:
+                continue
+            for price, qty in levels:
+                price = float(price)
+                qty = float(qty) * qty_scale
+                if qty == 0.0:
+                    book.pop(price, None)
+                else:
+                    book[price] = [Order(timestamp, price, qty, side)]
+            self._sort_book(side)
+
     def update_orderbook(self, new_bids: OrderedDict, new_asks: OrderedDict):
         if self.compare_and_swap:
             # Compare and update bids
@@ -101,13 +138,63 @@ class BTreeOrderbook:
 class OrderbookCollection:
     orderbooks: dict[str, BTreeOrderbook]
 
-    def __init__(self, exchange: str):
+    def __init__(self, exchange: str, book_type=BTreeOrderbook):
         self.exchange = exchange
+        self.book_type = book_type  # any class taking (instrument, compare_and_swap), e.g. ArrayOrderbook
         self.orderbooks = {}
+        self.listeners = []
 
     def add_orderbook(self, instrument: str,cas=False):
         if instrument not in self.orderbooks:
-            self.orderbooks[instrument] = BTreeOrderbook(instrument,cas)
+            self.orderbooks[instrument] = self.book_type(instrument,cas)
 
     def get_orderbook(self, instrument: str):
         return self.orderbooks.get(instrument)
+
+    def add_listener(self, callback):
+        """
+        Register callback(exchange, instrument, timestamp, bid_price, bid_qty, ask_price, ask_qty) for top of book updates.
+        """
+        self.listeners.append(callback)
+
+    def publish_bbo(self, instrument: str, timestamp: int,
+                    bid_price: float, bid_qty: float, ask_price: float, ask_qty: float):
+        for callback in self.listeners:
+            callback(self.exchange, instrument, timestamp, bid_price, bid_qty, ask_price, ask_qty)
+
+    def publish_book(self, instrument: str):
+        """
+        Publish the current best bid/ask of a book to the listeners.
+        """
+        if not self.listeners:
+            return
+        book = self.orderbooks.get(instrument)
+        bid = book.best_bid() if book else None
+        ask = book.best_ask() if book else None
+        if bid and ask:
+            self.publish_bbo(instrument, bid.timestamp, bid.price, bid.qty, ask.price, ask.qty)
+
+    def get_l2_arrays(self, instrument: str, depth: int):
+        """
+        Per-side (depth, 2) [price, qty] arrays for one instrument, views of the book storage for ArrayOrderbook.
+        """
+        book = self.orderbooks.get(instrument)
+        if book is None:
+            return None
+        return book.get_levels(Side.BID, depth), book.get_levels(Side.ASK, depth)
+
+    def get_l2_snapshot(self, depth: int, out: np.ndarray = None):
+        """
+        Stack every book into one (instruments, depth, 4) float64 array of bid_price, bid_qty, ask_price, ask_qty.
+        Pass the previous array as `out` to refill it in place without allocating.
+        :return: (instrument list in row order, array)
+        """
+        instruments = list(self.orderbooks.keys())
+        shape = (len(instruments), depth, 4)
+        if out is None or out.shape != shape:
+            out = np.empty(shape, dtype=np.float64)
+        for i, instrument in enumerate(instruments):
+            book = self.orderbooks[instrument]
+            out[i, :, 0:2] = book.get_levels(Side.BID, depth)
+            out[i, :, 2:4] = book.get_levels(Side.ASK, depth)
+        return instruments, out
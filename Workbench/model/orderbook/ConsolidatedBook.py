@@ -0,0 +1,175 @@
+import threading
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from Workbench.model.orderbook.BTreeOrderbook import OrderbookCollection, Side
+
+QUOTE_SUFFIXES = ("USDT", "USDC", "USD")
+
+
+def normalize_symbol(symbol: str) -> str:
+    """
+    Map venue symbols (`BTC-USDT`, `BTCUSDT`, `btcusdt`) to one `BASE/QUOTE` key (`BTC/USDT`), so the same pair on
+    different venues shares a key while `BTCUSDT` and `BTCUSDC` stay apart. Symbols without a known quote suffix,
+    e.g. Hyperliquid's `BTC`, are returned upper-cased as they are; map them explicitly with add_venue's symbol_map.
+    """
+    symbol = symbol.upper().replace("-", "").replace("_", "")
+    for suffix in QUOTE_SUFFIXES:
+        if symbol.endswith(suffix) and len(symbol) > len(suffix):
+            return f"{symbol[:-len(suffix)]}/{suffix}"
+    return symbol
+
+
+@dataclass
+class VenueQuote:
+    exchange: str
+    symbol: str  # venue symbol, e.g. BTC-USDT on HTX
+    timestamp: int = 0
+    bid_price: float = 0.0
+    bid_qty: float = 0.0
+    ask_price: float = 0.0
+    ask_qty: float = 0.0
+
+
+@dataclass
+class CrossVenueQuote:
+    symbol: str
+    best_bid: float = 0.0
+    best_bid_venue: str = None
+    best_ask: float = 0.0
+    best_ask_venue: str = None
+    edge_bp: float = 0.0  # best bid on one venue against best ask on another, > 0 is crossed
+
+
+class ConsolidatedBook:
+    """
+    Cross-venue view over several OrderbookCollections.
+    Each venue's top of book is pushed in through the collection listener, symbols are normalized once per
+    venue symbol and the best cross-venue bid/ask is recomputed for that symbol only.
+    Quotes arrive on every collector's thread, so updates and cross recomputes run under one lock and readers get
+    copies taken under the same lock.
+    """
+
+    def __init__(self):
+        self.collections = {}
+        self.quotes = {}  # symbol -> {exchange: VenueQuote}
+        self.cross = {}  # symbol -> CrossVenueQuote
+        self._symbol_cache = {}  # (exchange, venue symbol) -> symbol
+        self._aliases = {}
+        self._updated = set()
+        self._lock = threading.Lock()
+
+    def add_venue(self, collection: OrderbookCollection, symbol_map: dict = None):
+        """
+        Subscribe to a venue's OrderbookCollection.
+        :param symbol_map: optional venue symbol -> consolidated symbol overrides, e.g. {"BTC": "BTC/USDT"}.
+        """
+        self.collections[collection.exchange] = collection
+        self._aliases[collection.exchange] = symbol_map or {}
+        collection.add_listener(self.on_quote)
+
+    def _normalize(self, exchange: str, venue_symbol: str) -> str:
+        key = (exchange, venue_symbol)
+        symbol = self._symbol_cache.get(key)
+        if symbol is None:
+            symbol = self._aliases.get(exchange, {}).get(venue_symbol) or normalize_symbol(venue_symbol)
+            self._symbol_cache[key] = symbol
+        return symbol
+
+    def on_quote(self, exchange: str, venue_symbol: str, timestamp: int,
+                 bid_price: float, bid_qty: float, ask_price: float, ask_qty: float):
+        symbol = self._normalize(exchange, venue_symbol)
+        with self._lock:
+            venues = self.quotes.get(symbol)
+            if venues is None:
+                venues = self.quotes[symbol] = {}
+                self.cross[symbol] = CrossVenueQuote(symbol)
+            quote = venues.get(exchange)
+            if quote is None:
+                quote = venues[exchange] = VenueQuote(exchange, venue_symbol)
+            quote.timestamp = timestamp
+            quote.bid_price = bid_price or 0.0
+            quote.bid_qty = bid_qty or 0.0
+            quote.ask_price = ask_price or 0.0
+            quote.ask_qty = ask_qty or 0.0
+            self._update_cross(symbol, venues)
+            self._updated.add(symbol)
+
+    def _update_cross(self, symbol: str, venues: dict):
+        # called with the lock held
+        cross = self.cross[symbol]
+        best_bid, best_bid_venue, best_ask, best_ask_venue = 0.0, None, 0.0, None
+        for exchange, quote in venues.items():
+            if quote.bid_price > best_bid:
+                best_bid, best_bid_venue = quote.bid_price, exchange
+            if quote.ask_price > 0 and (best_ask_venue is None or quote.ask_price < best_ask):
+                best_ask, best_ask_venue = quote.ask_price, exchange
+        cross.best_bid, cross.best_bid_venue = best_bid, best_bid_venue
+        cross.best_ask, cross.best_ask_venue = best_ask, best_ask_venue
+        if best_bid and best_ask and best_bid_venue != best_ask_venue:
+            cross.edge_bp = (best_bid - best_ask) / best_ask * 10000
+        else:
+            cross.edge_bp = 0.0
+
+    def pop_updated(self) -> set:
+        """
+        Symbols whose quotes changed since the last call.
+        """
+        with self._lock:
+            updated, self._updated = self._updated, set()
+        return updated
+
+    def mark_updated(self, symbols):
+        """
+        Queue symbols for the next pop_updated again, e.g. ones a pass skipped or failed on.
+        """
+        with self._lock:
+            self._updated.update(symbols)
+
+    def get_quote(self, symbol: str, exchange: str):
+        """
+        Copy of exchange's current quote for symbol.
+        """
+        with self._lock:
+            quote = self.quotes.get(symbol, {}).get(exchange)
+            return replace(quote) if quote is not None else None
+
+    def get_cross(self, symbol: str):
+        """
+        Copy of the best cross-venue bid/ask for symbol.
+        """
+        with self._lock:
+            cross = self.cross.get(symbol)
+            return replace(cross) if cross is not None else None
+
+    def get_spread_bp(self, symbol: str, sell_exchange: str, buy_exchange: str):
+        """
+        Spread of selling at sell_exchange's bid against buying at buy_exchange's ask.
+        """
+        with self._lock:
+            venues = self.quotes.get(symbol, {})
+            sell, buy = venues.get(sell_exchange), venues.get(buy_exchange)
+            if sell is None or buy is None or not buy.ask_price:
+                return None
+            return (sell.bid_price - buy.ask_price) / buy.ask_price * 10000
+
+    def get_merged_levels(self, symbol: str, side: Side, depth: int) -> np.ndarray:
+        """
+        Merged ladder across venues as a (depth, 3) float64 array of price, qty, venue index,
+        the venue index follows the order of `self.collections`.
+        """
+        rows = []
+        for venue_index, (exchange, collection) in enumerate(self.collections.items()):
+            quote = self.get_quote(symbol, exchange)
+            book = collection.get_orderbook(quote.symbol) if quote else None
+            if book is None:
+                continue
+            levels = book.get_levels(side, depth)
+            levels = levels[levels[:, 1] > 0]
+            rows.append(np.column_stack((levels, np.full(len(levels), venue_index, dtype=np.float64))))
+        if not rows:
+            return np.zeros((0, 3), dtype=np.float64)
+        merged = np.concatenate(rows)
+        order = np.argsort(-merged[:, 0] if side == Side.BID else merged[:, 0], kind="stable")
+        return merged[order[:depth]]
@@ -0,0 +1,118 @@
+import logging
+import time
+from collections import deque
+
+from Workbench.model.orderbook.ArrayOrderbook import ArrayOrderbook, DEFAULT_CAPACITY
+
+logger = logging.getLogger(__name__)
+
+MAX_BUFFERED_DELTAS = 1000
+RESYNC_COOLDOWN_SEC = 1.0
+RESYNC_TIMEOUT_SEC = 10.0  # re-request if a snapshot has not arrived within this time
+
+
+class SequencedOrderbook(ArrayOrderbook):
+    """
+    ArrayOrderbook for diff-depth streams that carry update IDs (Bybit `u`, Binance `U`/`u`/`pu`).
+    Deltas are only applied when they continue the last applied update ID. On a gap the book is marked
+    unsynced, deltas are buffered and `resync_handler(book)` is called so the collector can fetch a REST
+    snapshot or resubscribe for a WS snapshot.
+    """
+
+    def __init__(self, instrument: str,
+                 compare_and_swap: bool = False,
+                 capacity: int = DEFAULT_CAPACITY,
+                 max_buffer: int = MAX_BUFFERED_DELTAS):
+        super().__init__(instrument, compare_and_swap, capacity)
+        self.last_update_id = None
+        self.gap_count = 0
+        self.resync_handler = None  # callable(book) requesting a fresh snapshot
+        self._awaiting_bridge = False
+        self._buffer = deque(maxlen=max_buffer)
+        self._staged_snapshot = None
+        self._resync_pending = False
+        self._last_resync = float("-inf")
+
+    @property
+    def is_synced(self) -> bool:
+        return self.last_update_id is not None
+
+    def stage_snapshot(self, bids, asks, update_id: int, timestamp: int = 0):
+        """
+        Hand over a snapshot fetched off the message thread, it is applied before the next delta.
+        """
+        self._staged_snapshot = (bids, asks, update_id, timestamp)
+
+    def abort_resync(self):
+        """
+        Called by the resync handler when the snapshot could not be fetched, the next delta retries.
+        """
+        self._resync_pending = False
+
+    def apply_sequenced_snapshot(self, bids, asks, update_id: int, timestamp: int = 0):
+        self.apply_snapshot(bids, asks, timestamp)
+        self.last_update_id = update_id
+        self._awaiting_bridge = True
+        self._resync_pending = False
+        buffered = list(self._buffer)
+        self._buffer.clear()
+        for delta in buffered:
+            self.apply_sequenced_delta(*delta)
+
+    def apply_sequenced_delta(self, bids, asks, first_id: int, last_id: int, prev_id: int = None,
+                              timestamp: int = 0) -> bool:
+        """
+        Apply a delta covering update IDs first_id..last_id.
+        :param prev_id: last_id of the previous event when the venue sends it (Binance `pu`),
+                        otherwise first_id must be last_update_id + 1.
+        :return: True if the delta was applied to the book.
+        """
+        staged = self._staged_snapshot
+        if staged is not None:
+            self._staged_snapshot = None
+            self.apply_sequenced_snapshot(*staged)
+
+        if self.last_update_id is None:
+            self._buffer.append((bids, asks, first_id, last_id, prev_id, timestamp))
+            self._request_resync()
+            return False
+
+        if last_id <= self.last_update_id:
+            return False  # already covered by the snapshot
+
+        if self._awaiting_bridge:
+            contiguous = first_id <= self.last_update_id + 1
+        elif prev_id is not None:
+            contiguous = prev_id == self.last_update_id
+        else:
+            contiguous = first_id == self.last_update_id + 1
+
+        if not contiguous:
+            self.gap_count += 1
+            logger.warning(f"{self.instrument} orderbook gap: last update {self.last_update_id}, "
+                           f"received {first_id}-{last_id}, resyncing")
+            self.last_update_id = None
+            self._buffer.clear()
+            self._buffer.append((bids, asks, first_id, last_id, prev_id, timestamp))
+            self._request_resync()
+            return False
+
+        self.apply_delta(bids, asks, timestamp)
+        self.last_update_id = last_id
+        self._awaiting_bridge = False
+        return True
+
+    def _request_resync(self):
+        if self.resync_handler is None:
+            return
+        now = time.monotonic()
+        elapsed = now - self._last_resync
+        if elapsed < RESYNC_COOLDOWN_SEC or (self._resync_pending and elapsed < RESYNC_TIMEOUT_SEC):
+            return
+        self._resync_pending = True
+        self._last_resync = now
+        try:
+            self.resync_handler(self)
+        except Exception as e:
+            logger.error(f"{self.instrument} resync request failed: {e}")
+            self._resync_pending = False
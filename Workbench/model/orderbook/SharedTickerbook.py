@@ -0,0 +1,114 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Workbench.model.orderbook.ConsolidatedBook import normalize_symbol
+
+# Slot layout, one row of 8 byte fields per symbol. SEQ and TIMESTAMP are read through an int64 view and the
+# prices/quantities through a float64 view of the same buffer.
+SEQ, TIMESTAMP, BID_PRICE, BID_QTY, ASK_PRICE, ASK_QTY = range(6)
+SLOT_FIELDS = 6
+MAX_READ_RETRIES = 100
+
+
+class SharedTickerbook:
+    """
+    Top of book for a fixed symbol list in a shared-memory array, written by one collector process and read
+    lock-free by any number of others.
+    Each slot is guarded by a seqlock: the writer bumps SEQ to odd, writes the quote, then bumps it back to even;
+    a reader copies the slot and retries if SEQ was odd or changed underneath it. Symbols are keyed by their
+    normalized pair (`BTC-USDT` and `BTCUSDT` share a slot, `BTCUSDC` gets its own) and both sides must be built
+    from the same symbol list, in the same order.
+    """
+
+    def __init__(self, symbols: list, name: str = None, create: bool = True):
+        """
+        :param symbols: symbols to allocate slots for, the slot order follows this list.
+        :param name: shared memory name to attach to when create is False.
+        """
+        self.slots = {}  # normalized symbol -> slot
+        self.symbols = []  # slot -> symbol as given, reported back by read_updated
+        for symbol in symbols:
+            key = normalize_symbol(symbol)
+            if key not in self.slots:
+                self.slots[key] = len(self.symbols)
+                self.symbols.append(symbol)
+        size = max(len(self.slots), 1) * SLOT_FIELDS * 8
+        self.is_owner = create
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.name = self.shm.name
+        shape = (max(len(self.slots), 1), SLOT_FIELDS)
+        self._ints = np.ndarray(shape, dtype=np.int64, buffer=self.shm.buf)
+        self._floats = np.ndarray(shape, dtype=np.float64, buffer=self.shm.buf)
+        if create:
+            self._ints[:] = 0
+        self._slot_cache = {}  # venue symbol -> slot or None
+        self._last_seq = np.zeros(shape[0], dtype=np.int64)
+
+    def slot(self, symbol: str):
+        slot = self._slot_cache.get(symbol, -1)
+        if slot == -1:
+            slot = self._slot_cache[symbol] = self.slots.get(normalize_symbol(symbol))
+        return slot
+
+    def write(self, symbol: str, timestamp: int, bid_price: float, bid_qty: float, ask_price: float, ask_qty: float):
+        """
+        Single-writer update of one slot, symbols without a slot are ignored.
+        """
+        slot = self.slot(symbol)
+        if slot is None:
+            return
+        ints = self._ints
+        seq = int(ints[slot, SEQ])
+        ints[slot, SEQ] = seq + 1  # odd: write in progress
+        ints[slot, TIMESTAMP] = timestamp or 0
+        self._floats[slot, BID_PRICE:ASK_QTY + 1] = (bid_price or 0.0, bid_qty or 0.0, ask_price or 0.0, ask_qty or 0.0)
+        ints[slot, SEQ] = seq + 2
+
+    def on_quote(self, exchange: str, symbol: str, timestamp: int,
+                 bid_price: float, bid_qty: float, ask_price: float, ask_qty: float):
+        """
+        OrderbookCollection listener signature, so a collector's books publish straight into shared memory.
+        """
+        self.write(symbol, timestamp, bid_price, bid_qty, ask_price, ask_qty)
+
+    def read(self, symbol: str):
+        """
+        Consistent (seq, timestamp, bid_price, bid_qty, ask_price, ask_qty) for symbol, or None if it has no slot,
+        was never written or stayed mid-write for MAX_READ_RETRIES attempts.
+        """
+        slot = self.slot(symbol)
+        return self._read_slot(slot) if slot is not None else None
+
+    def _read_slot(self, slot: int):
+        ints, floats = self._ints, self._floats
+        for _ in range(MAX_READ_RETRIES):
+            seq = int(ints[slot, SEQ])
+            if seq & 1:
+                continue
+            timestamp = int(ints[slot, TIMESTAMP])
+            bid_price, bid_qty, ask_price, ask_qty = floats[slot, BID_PRICE:ASK_QTY + 1].tolist()
+            if int(ints[slot, SEQ]) == seq:
+                return (seq, timestamp, bid_price, bid_qty, ask_price, ask_qty) if seq else None
+        return None
+
+    def read_updated(self) -> list:
+        """
+        Quotes of the slots written since the last call, as (symbol, timestamp, bid_price, bid_qty, ask_price, ask_qty).
+        The changed slots are found with one vectorized compare of the sequence column.
+        """
+        seqs = self._ints[:, SEQ]
+        updated = []
+        for slot in np.flatnonzero(seqs != self._last_seq).tolist():
+            quote = self._read_slot(slot)
+            if quote is None:
+                continue
+            self._last_seq[slot] = quote[0]
+            updated.append((self.symbols[slot],) + quote[1:])
+        return updated
+
+    def close(self):
+        self._ints = self._floats = None
+        self.shm.close()
+        if self.is_owner:
+            self.shm.unlink()
@@ -3,12 +3,19 @@ from influxdb_client.client.write_api import SYNCHRONOUS
 import os
 import threading
 import time
-from queue import Queue, Empty
+from queue import Empty
 from Workbench.transport.BaseHandler import BaseHandler
+from Workbench.transport.ingest_queue import IngestQueue, BLOCK
 
 class InfluxClient(BaseHandler):
+    """
+    InfluxDB reader and writer. Points queued with batch_write are written in batches by a background thread
+    through a queue bounded at max_queue_size, see IngestQueue for the queue_policy options. Conflation keys on
+    bucket, measurement and tags.
+    """
 
-    def __init__(self, url, org, token=None, batch_size=100, flush_interval=1.0):
+    def __init__(self, url, org, token=None, batch_size=100, flush_interval=1.0,
+                 max_queue_size=100_000, queue_policy=BLOCK, block_timeout=None):
         super().__init__("InfluxClient")
         token = token or os.getenv('INFLUX_TOKEN')
         if not token:
@@ -20,7 +27,7 @@ class InfluxClient(BaseHandler):
         self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
         self.read_api = self.client.query_api()
 
-        self.queue = Queue()
+        self.queue = IngestQueue(max_queue_size, queue_policy, key=self._point_key, block_timeout=block_timeout)
         self.batch_size = batch_size
         self.flush_interval = flush_interval
 
@@ -37,6 +44,17 @@ class InfluxClient(BaseHandler):
     def write(self, bucket, point:Point):
         self.write_api.write(bucket=bucket,org=self.org, record=point)
 
+    def batch_write(self, bucket, point: Point):
+        """
+        Queue a point for the background writer.
+        """
+        self.queue.put_nowait((bucket, point))
+
+    @staticmethod
+    def _point_key(item):
+        bucket, point = item
+        return bucket, point._name, tuple(sorted(point._tags.items()))
+
     def _flush_batch(self, batch):
         try:
             buckets = set(bucket for bucket, _ in batch)
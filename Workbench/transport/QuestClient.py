@@ -1,13 +1,54 @@
 
+import os
 import time
 import threading
 import psycopg2
+import psycopg2.pool
+import numpy as np
 import pandas as pd
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from queue import Queue, Empty
+from queue import Empty
 from Workbench.transport.BaseHandler import BaseHandler  # adjust if file name is different
-from questdb.ingress import Sender, TimestampNanos
+from Workbench.transport.ingest_queue import IngestQueue, BLOCK
+from Workbench.transport.ilp_spool import IlpSpool, DEFAULT_SPOOL_DIR, send_ilp_tcp
+from questdb.ingress import Buffer, Sender, ServerTimestamp, TimestampNanos
+
+# PostgreSQL type OIDs QuestDB reports over the wire protocol
+PG_TIMESTAMP_OIDS = {1082, 1114, 1184}
+PG_FLOAT_OIDS = {700, 701, 1700}
+PG_INT_OIDS = {20, 21, 23}
+PG_BOOL_OID = 16
+
+
+def _column_array(values: tuple, type_code: int):
+    """
+    One result column as an array of its proper dtype. Integer columns holding NULLs fall back to float64.
+    """
+    if type_code in PG_TIMESTAMP_OIDS:
+        return pd.to_datetime(values, utc=type_code == 1184).as_unit("ns")
+    if type_code in PG_FLOAT_OIDS:
+        return np.array(values, dtype=np.float64)
+    if type_code in PG_INT_OIDS:
+        return np.array(values, dtype=np.float64 if None in values else np.int64)
+    if type_code == PG_BOOL_OID and None not in values:
+        return np.array(values, dtype=bool)
+    return np.array(values, dtype=object)
+
+
+def frame_from_rows(rows: list, description) -> pd.DataFrame:
+    """
+    Build a DataFrame column by column from DB-API rows, indexed by `timestamp` when the result has one.
+    """
+    names = [desc[0] for desc in description]
+    columns = zip(*rows) if rows else [()] * len(names)
+    df = pd.DataFrame({name: _column_array(values, desc[1])
+                       for name, values, desc in zip(names, columns, description)}, columns=names)
+    if 'timestamp' in df.columns:
+        df.set_index('timestamp', inplace=True)
+    return df
+
 
 @dataclass
 class QuestBatch:
@@ -17,43 +58,148 @@ class QuestBatch:
     timestamp: datetime
 
 
+@dataclass(frozen=True)
+class QuestRowLayout:
+    """
+    Fixed table layout for rows queued as plain tuples `(timestamp_ms, *symbols, *columns)`,
+    so producers enqueue one tuple instead of a QuestBatch with two dicts and a datetime.
+    Buffer.row only takes dicts, so send writes each row's values by position into two dicts the layout allocates
+    once instead of building new ones per row. send is therefore only safe from a single thread, the writer's.
+    """
+    table: str
+    symbols: tuple
+    columns: tuple
+    _symbol_values: dict = field(init=False, repr=False, compare=False)
+    _column_values: dict = field(init=False, repr=False, compare=False)
+    _positions: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        split = 1 + len(self.symbols)
+        object.__setattr__(self, "_symbol_values", dict.fromkeys(self.symbols))
+        object.__setattr__(self, "_column_values", dict.fromkeys(self.columns))
+        object.__setattr__(self, "_positions", (tuple(enumerate(self.symbols, 1)),
+                                                tuple(enumerate(self.columns, split))))
+
+    def send(self, buffer, row: tuple):
+        symbol_values, column_values = self._symbol_values, self._column_values
+        symbol_positions, column_positions = self._positions
+        for i, name in symbol_positions:
+            symbol_values[name] = row[i]
+        for i, name in column_positions:
+            column_values[name] = row[i]
+        buffer.row(self.table, symbols=symbol_values, columns=column_values,
+                   at=TimestampNanos(int(row[0]) * 1_000_000))
+
+
+@dataclass(eq=False)
+class EncodedBatch:
+    """
+    Rows already serialized into their own ILP buffer, sent by the writer as one flush.
+    """
+    buffer: Buffer
+    rows: int
+
+
 class QuestDBClient(BaseHandler):
+    """
+    QuestDB writer and reader. Queued rows are written by one background thread into an ILP buffer that is sent over
+    a single long-lived TCP sender once it holds batch_size rows or max_buffer_bytes bytes, or flush_interval
+    seconds after its first row. The sender is only reconnected after a failed flush.
+    A batch that cannot be sent is appended to an IlpSpool under spool_dir (capped at max_spool_bytes, one slot per
+    writing process) and the writer keeps draining the queue, spooling further batches until a reconnect attempt
+    every reconnect_interval succeeds;
+    the spool is then replayed in order before new rows. With spool_dir=None the unsent buffer stays in memory and
+    is retried instead.
+    The queue holds at most max_queue_size rows, see IngestQueue for the queue_policy options. Conflation keys on
+    table and symbol columns. DataFrame batches count as one item and are never dropped, a full queue makes
+    write_dataframe wait instead.
+    Reads share a pool of up to pool_size PostgreSQL wire connections and build results column-wise into typed arrays,
+    chunk_size rows at a time. QuestDB has no server-side cursors, so the wire client still receives the full result;
+    chunking bounds the Python rows and DataFrames built from it, page large ranges with LIMIT or time windows.
+    """
+
     def __init__(self, host, port, batch_size=1000,
                  user="clarenceovo", password="96854233",
-                 flush_interval=0.5,read_only=False):
+                 flush_interval=0.5,read_only=False,
+                 max_buffer_bytes=1024 * 1024, reconnect_interval=1.0,
+                 max_queue_size=100_000, queue_policy=BLOCK, block_timeout=None,
+                 spool_dir=DEFAULT_SPOOL_DIR, max_spool_bytes=1024 ** 3,
+                 pool_size=4, chunk_size=50_000):
         super().__init__("QuestDBClient")
         self.is_active = True
         self.host = host
         self.port = port
+        self.user = user
+        self.password = password
+        self.pool_size = pool_size
+        self.chunk_size = chunk_size
+        self._pool = None
+        self._pool_lock = threading.Lock()
         if read_only:
             self.port = 8812  # Use the default read port for QuestDB
 
         self.write_url = f"tcp::addr={host}:{port};"
-        self.queue = Queue()
+        self.queue = IngestQueue(max_queue_size, queue_policy, key=self._row_key, block_timeout=block_timeout,
+                                 pinned=lambda item: type(item) is EncodedBatch)
         self.batch_size = batch_size
         self.flush_interval = flush_interval
+        self.max_buffer_bytes = max_buffer_bytes
+        self.reconnect_interval = reconnect_interval
+        self.rows_written = 0
+        self.flush_errors = 0
+        self._sender = None
+        self._retry_at = 0.0
+        self._outage = None  # (monotonic start, flush_errors at start) while QuestDB is unreachable
         self._stop_event = threading.Event()
+        self.spool = None
+        self.thread = None
         if read_only is False:
+            if spool_dir is not None:
+                self.spool = IlpSpool(os.path.join(spool_dir, f"{host}_{port}"), max_bytes=max_spool_bytes)
             self.thread = threading.Thread(target=self._run, daemon=True)
             self.thread.start()
 
-    def _get_pg_client(self):
-        self.read_conn = psycopg2.connect(host=self.host,
-                                          port=self.port,
-                                          dbname='qdb',
-                                          user="clarenceovo",
-                                          password="96854233")
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = psycopg2.pool.ThreadedConnectionPool(1, self.pool_size,
+                                                                  host=self.host,
+                                                                  port=self.port,
+                                                                  dbname='qdb',
+                                                                  user=self.user,
+                                                                  password=self.password)
+            return self._pool
 
+    @contextmanager
+    def _connection(self):
+        """
+        Borrow a pooled connection, its transaction is rolled back on return. Connections that failed at the
+        connection level are discarded instead of returned.
+        """
+        pool = self._get_pool()
+        conn = pool.getconn()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            if not broken and not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            pool.putconn(conn, close=broken or bool(conn.closed))
 
     def write(self, table, symbol, columns, timestamp=None):
+        """
+        Queue a single row for the writer thread.
+        :param timestamp: datetime or TimestampNanos, defaults to now.
+        """
         if timestamp is None:
             timestamp = TimestampNanos.now()
-        with Sender.from_conf(self.write_url) as sender:
-            sender.row(table,
-                       symbols=symbol,
-                       columns=columns,
-                       at=timestamp)
-            sender.flush()
+        self.queue.put_nowait(QuestBatch(table, symbol, columns, timestamp))
 
     def batch_write(self, batch: QuestBatch):
         """
@@ -63,56 +209,237 @@ class QuestDBClient(BaseHandler):
 
         self.queue.put_nowait(batch)
 
-    def execute_query(self, query: str) -> pd.DataFrame:
+    def batch_write_row(self, layout: QuestRowLayout, row: tuple):
         """
-        Execute a SQL SELECT query against QuestDB's HTTP API and return a Pandas DataFrame.
+        Queue a row as a plain tuple, see QuestRowLayout.
         """
-        #use posgresql connector to execute query
-        self._get_pg_client()
-        with self.read_conn.cursor() as cursor:
-            cursor.execute(query)
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
-            df = pd.DataFrame(data, columns=columns)
-            #set timestamp as index if it exists
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ns')
-                df.set_index('timestamp', inplace=True)
-            self.read_conn.close()
-            return df
+        self.queue.put_nowait((layout, row))
 
-    def _run(self):
+    def write_dataframe(self, table: str, df: pd.DataFrame, symbols="auto", at=None, chunk_rows: int = 100_000) -> int:
         """
-        Send batch to QuestDB.
+        Queue a whole DataFrame for columnar ingestion. Each chunk of chunk_rows rows is serialized in the calling
+        thread by the questdb client's native DataFrame encoder and sent by the writer as a single flush, instead of
+        one Python row object per row.
+        :param symbols: columns to send as symbols, a list of names, or "auto" for the categorical columns.
+        :param at: designated timestamp column name (datetime64, naive values are UTC), or None for server time.
+        :return: number of rows queued.
         """
-        self.logger.info("QuestDBClient started batch writing loop...")
-        flush_count = 0
-        while self.is_active:
+        if at is None:
+            at = ServerTimestamp
+        # the encoder only accepts nanosecond datetimes, pandas may infer us/ms units, and categoricals of object
+        # categories, pandas 3 infers str categories
+        casts = {}
+        for col, dtype in df.dtypes.items():
+            if dtype.kind == "M" and "[ns" not in str(dtype):
+                casts[col] = str(dtype).replace("[us", "[ns").replace("[ms", "[ns").replace("[s", "[ns")
+            elif isinstance(dtype, pd.CategoricalDtype) and dtype.categories.dtype != object:
+                casts[col] = pd.CategoricalDtype(dtype.categories.astype(object), dtype.ordered)
+        if casts:
+            df = df.astype(casts)
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            buffer = Buffer()
+            buffer.dataframe(chunk, table_name=table, symbols=symbols, at=at)
+            self.queue.put(EncodedBatch(buffer, len(chunk)))
+        return len(df)
+
+    def execute_query(self, query: str, params=None) -> pd.DataFrame:
+        """
+        Execute a SQL SELECT query against QuestDB over the PostgreSQL wire protocol and return a Pandas DataFrame,
+        indexed by timestamp if the result has that column.
+        """
+        chunks = list(self.iter_query(query, params=params))
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks)
+
+    def iter_query(self, query: str, chunk_size: int = None, params=None):
+        """
+        Yield a query's result as DataFrames of at most chunk_size rows, so it is never held as Python tuples all at
+        once. The whole result is still received into client memory first, QuestDB cannot stream it.
+        A stale pooled connection is replaced and the query retried once, as long as nothing was yielded yet.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        for attempt in range(2):
+            yielded = False
             try:
-                with Sender.from_conf(self.write_url) as sender:
-                    try:
-                        while not self.queue.empty():
-                            item = self.queue.get_nowait()
-                            ts= TimestampNanos.from_datetime(item.timestamp)
-                            sender.row(item.topic,
-                                       symbols=item.symbol,
-                                       columns=item.columns,
-                                       at=ts)
-                            #sender.flush()
-                    except Exception as e:
-                        print(e)
-                    sender.flush()
-                    time.sleep(self.flush_interval)
-                    #check Sender status
+                with self._connection() as conn:
+                    for chunk in self._fetch_chunks(conn, query, params, chunk_size):
+                        yielded = True
+                        yield chunk
+                return
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                if yielded or attempt:
+                    raise
+                self.logger.warning(f"Retrying query on a new connection: {e}")
 
+    def _fetch_chunks(self, conn, query: str, params, chunk_size: int):
+        # QuestDB has no DECLARE CURSOR, so libpq receives the whole result; fetching it in chunks only bounds how
+        # many rows are converted to Python tuples and DataFrames at once.
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchmany(chunk_size)
+            yield frame_from_rows(rows, cursor.description)
+            while len(rows) == chunk_size:
+                rows = cursor.fetchmany(chunk_size)
+                if rows:
+                    yield frame_from_rows(rows, cursor.description)
 
+    def _run(self):
+        """
+        Drain the queue into an ILP buffer and flush it on row count, size or deadline.
+        """
+        self.logger.info("QuestDBClient started batch writing loop...")
+        buffer = Buffer()
+        rows = 0
+        deadline = None
+        while not self._stop_event.is_set():
+            timeout = self.flush_interval if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self.queue.get(timeout=timeout)
             except Empty:
+                item = None
+            if type(item) is EncodedBatch:
+                rows = self._send_encoded(buffer, rows, item)
+                deadline = time.monotonic() + self.flush_interval if rows else None
                 continue
+            if item is not None:
+                try:
+                    self._append(buffer, item)
+                    rows += 1
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                except Exception as e:
+                    self.logger.error(f"Dropping row that could not be encoded {item!r}: {e}")
+            if rows and (rows >= self.batch_size or len(buffer) >= self.max_buffer_bytes
+                         or time.monotonic() >= deadline):
+                if self._flush(buffer, rows):
+                    rows = 0
+                    deadline = None
+                else:
+                    self._stop_event.wait(self.reconnect_interval)
+            elif not rows and self.spool and time.monotonic() >= self._retry_at:
+                self._flush(buffer, 0)  # replay the spool even when no new rows arrive
+        # drain what is left on shutdown
+        while True:
+            try:
+                item = self.queue.get_nowait()
+                if type(item) is EncodedBatch:
+                    rows = self._send_encoded(buffer, rows, item)
+                    continue
+                self._append(buffer, item)
+                rows += 1
+            except Empty:
+                break
+            except Exception as e:
+                self.logger.error(f"Dropping row that could not be encoded: {e}")
+        if rows:
+            self._flush(buffer, rows)
+        self._close_sender()
+
+    def _send_encoded(self, buffer, rows: int, batch: EncodedBatch) -> int:
+        """
+        Flush rows already buffered, then the encoded batch, retrying each while the writer runs. The batch is only
+        sent once the rows queued before it are sent or spooled, so it never overtakes them.
+        :return: rows left in buffer.
+        """
+        while rows and not self._flush(buffer, rows):
+            if self._stop_event.wait(self.reconnect_interval):
+                self.logger.error(f"Dropping {batch.rows} encoded rows on shutdown")
+                return rows
+        rows = 0
+        while not self._flush(batch.buffer, batch.rows):
+            if self._stop_event.wait(self.reconnect_interval):
+                self.logger.error(f"Dropping {batch.rows} encoded rows on shutdown")
+                break
+        return rows
+
+    @staticmethod
+    def _row_key(item):
+        if type(item) is EncodedBatch:
+            return item
+        if type(item) is tuple:
+            layout, row = item
+            return layout.table, row[1:1 + len(layout.symbols)]
+        return item.topic, tuple(item.symbol.items())
+
+    @staticmethod
+    def _append(buffer, item):
+        if type(item) is tuple:
+            item[0].send(buffer, item[1])
+            return
+        ts = item.timestamp
+        if not isinstance(ts, TimestampNanos):
+            ts = TimestampNanos.from_datetime(ts)
+        buffer.row(item.topic,
+                   symbols=item.symbol,
+                   columns=item.columns,
+                   at=ts)
+
+    def _flush(self, buffer, rows: int) -> bool:
+        """
+        Send the buffer on the persistent sender, connecting and replaying the spool first if needed. A batch that
+        fails is spooled, or kept in the buffer when there is no spool.
+        :return: False if the buffer still holds the rows.
+        """
+        if self.spool and time.monotonic() < self._retry_at:
+            return self._spill(buffer, rows)
+        try:
+            if self._sender is None:
+                self._sender = Sender.from_conf(self.write_url)
+                self._sender.establish()
+                self.logger.info(f"Connected ILP sender to {self.host}:{self.port}")
+            if self.spool:
+                replayed = self.spool.replay(lambda data: send_ilp_tcp(self.host, self.port, data))
+                self.logger.info(f"Replayed {replayed} spooled bytes to QuestDB")
+            self._sender.flush(buffer, clear=False)
+        except Exception as e:
+            self.flush_errors += 1
+            if self._outage is None:
+                # once per outage, the retries every reconnect_interval are only logged at debug level
+                self._outage = (time.monotonic(), self.flush_errors - 1)
+                self.logger.error(f"QuestDB flush of {rows} rows failed, retrying every {self.reconnect_interval}s "
+                                  f"({self.queue.qsize()} queued, {self.queue.dropped} dropped): {e}")
+            else:
+                self.logger.debug(f"QuestDB still unreachable: {e}")
+            self._close_sender()
+            self._retry_at = time.monotonic() + self.reconnect_interval
+            return self._spill(buffer, rows) if self.spool is not None else False
+        if self._outage is not None:
+            started, errors = self._outage
+            self._outage = None
+            self.logger.info(f"QuestDB flushes recovered after {time.monotonic() - started:.1f}s and "
+                             f"{self.flush_errors - errors} failed attempts ({self.queue.dropped} dropped so far)")
+        buffer.clear()
+        self.rows_written += rows
+        return True
+
+    def _spill(self, buffer, rows: int) -> bool:
+        try:
+            self.spool.append(str(buffer).encode())
+        except OSError as e:
+            self.logger.error(f"Could not spool {rows} rows: {e}")
+            return False
+        buffer.clear()
+        return True
+
+    def _close_sender(self):
+        if self._sender is not None:
+            try:
+                self._sender.close(flush=False)
+            except Exception as e:
+                self.logger.warning(f"Error closing ILP sender: {e}")
+            self._sender = None
 
     def stop(self):
         """
-        Graceful shutdown.
+        Graceful shutdown, flushing rows still queued.
         """
         self._stop_event.set()
-        self.thread.join()
+        if self.thread is not None:
+            self.thread.join()
+        if self._pool is not None:
+            self._pool.closeall()
+        if self.spool is not None:
+            self.spool.close()
         self.logger.info("QuestDBClient stopped.")
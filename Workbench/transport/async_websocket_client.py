@@ -0,0 +1,143 @@
+import asyncio
+import inspect
+from Workbench.transport import json_codec
+import logging
+import ssl
+import threading
+
+from websockets.asyncio.client import connect
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopThread:
+    """
+    One asyncio event loop running in a daemon thread, shared by every AsyncWebsocketClient in the process.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="ws-event-loop", daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def get(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = EventLoopThread()
+            return cls._instance
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+class AsyncWebsocketClient:
+    """
+    asyncio replacement for WebsocketClient with the same send/register_callback/start surface.
+    All connections share one event loop thread, outgoing messages wake the sender immediately instead of
+    being polled, and the callback may be a plain function or a coroutine function.
+    """
+
+    def __init__(self, url, callback=None, header=None, event_loop: EventLoopThread = None):
+        logger.info("Initializing async WebSocket client...URL: {}".format(url))
+        self.wsUrl = url
+        self.header = header
+        self.transportType = "websocket"
+        self.is_running = True  # as in WebsocketClient, sends before start() are queued
+        self._callback = callback
+        self._event_loop = event_loop or EventLoopThread.get()
+        self._outgoing = asyncio.Queue()
+        self._future = None
+        self.webSocket = None
+        self.recorder = None  # optional FrameRecorder capturing every raw frame
+
+    def register_callback(self, callback):
+        """
+        Register a callback function to be called when a message is received.
+        :param callback: function or coroutine function taking the raw message.
+        """
+        self._callback = callback
+
+    def start(self):
+        """
+        Schedule the connection on the shared event loop and return immediately.
+        """
+        self.is_running = True
+        self._future = self._event_loop.submit(self._run())
+
+    def send(self, msg, coalesce: str = None):
+        """
+        Send a message to the WebSocket server, messages sent before the socket opens are queued.
+        :param msg: The message to send.
+        :param coalesce: accepted for WebsocketClient compatibility, messages are sent one frame each.
+        """
+        if not self.is_running:
+            logger.error("WebSocket client is not running.")
+            return
+        payload = msg if msg == "ping" else self.messsagePraser(msg)
+        self._event_loop.loop.call_soon_threadsafe(self._outgoing.put_nowait, payload)
+
+    def stop(self):
+        logger.info("Stopping async Websocket Client...")
+        self.is_running = False
+        if self.webSocket is not None:
+            self._event_loop.submit(self.webSocket.close())
+        elif self._future is not None:
+            self._future.cancel()
+
+    def _headers(self):
+        if not self.header:
+            return None
+        if isinstance(self.header, dict):
+            return self.header
+        # websocket-client style ["Key: value", ...]
+        return [tuple(item.strip() for item in line.split(":", 1)) for line in self.header]
+
+    async def _run(self):
+        ssl_context = None
+        if self.wsUrl.startswith("wss"):
+            # match WebsocketClient, which runs with certificate verification disabled
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+        try:
+            async with connect(self.wsUrl, additional_headers=self._headers(), ssl=ssl_context,
+                               max_size=None) as ws:
+                self.webSocket = ws
+                sender = asyncio.create_task(self._send_loop(ws))
+                try:
+                    async for message in ws:
+                        await self._dispatch(message)
+                finally:
+                    sender.cancel()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(e)
+            logger.error(self.wsUrl)
+        finally:
+            logger.error("websocket is closed.")
+            self.is_running = False
+
+    async def _send_loop(self, ws):
+        while True:
+            payload = await self._outgoing.get()
+            await ws.send(payload)
+
+    async def _dispatch(self, message):
+        if self.recorder is not None:
+            self.recorder.write(message)
+        try:
+            result = self._callback(message)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"WebSocket callback failed: {e}")
+
+    def messsagePraser(self, msg):
+        return json_codec.dumps(msg)
+
+    def messageLoader(self, msg):
+        return json_codec.loads(msg)
@@ -0,0 +1,102 @@
+import os
+import struct
+import threading
+import time
+
+# Capture file layout: an 8 byte magic header followed by append-only records of
+#     <int64 receive time in ns><uint8 flags><uint32 payload length><payload>
+# flags bit 0 marks a binary frame (e.g. HTX gzip), otherwise the payload is a UTF-8 text frame.
+MAGIC = b"WBFRAME1"
+RECORD_HEADER = struct.Struct("<qBI")
+FLAG_BINARY = 1
+
+
+class FrameRecorder:
+    """
+    Appends raw WebSocket frames with their receive timestamp to a capture file.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, buffer_size: int = 1 << 20):
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.path = path
+        self.flush_interval = flush_interval
+        self.frame_count = 0
+        self._file = open(path, "ab", buffering=buffer_size)
+        if is_new:
+            self._file.write(MAGIC)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def write(self, message, ts_ns: int = None):
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        if isinstance(message, str):
+            payload, flags = message.encode("utf-8"), 0
+        else:
+            payload, flags = bytes(message), FLAG_BINARY
+        with self._lock:
+            self._file.write(RECORD_HEADER.pack(ts_ns, flags, len(payload)))
+            self._file.write(payload)
+            self.frame_count += 1
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class FrameReplayer:
+    """
+    Reads a capture file written by FrameRecorder and pushes the frames through a collector handler.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def frames(self):
+        """
+        Yield (receive time in ns, message) with text frames as str and binary frames as bytes,
+        the same types websocket-client hands to on_message.
+        """
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a frame capture file")
+            header_size = RECORD_HEADER.size
+            while True:
+                header = f.read(header_size)
+                if len(header) < header_size:
+                    return
+                ts_ns, flags, length = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    return  # truncated tail from an interrupted capture
+                yield ts_ns, payload if flags & FLAG_BINARY else payload.decode("utf-8")
+
+    def load(self) -> list:
+        """
+        Read every frame into memory, useful to keep file IO out of a benchmark loop.
+        """
+        return list(self.frames())
+
+    def replay(self, callback, speed: float = None) -> int:
+        """
+        Push every frame through callback, e.g. a collector's `_message_handler`.
+        :param speed: None replays as fast as possible, 1.0 at recorded pace, 2.0 twice as fast.
+        :return: number of frames replayed.
+        """
+        count = 0
+        first_ts = None
+        start = time.perf_counter()
+        for ts_ns, message in self.frames():
+            if speed:
+                if first_ts is None:
+                    first_ts = ts_ns
+                delay = (ts_ns - first_ts) / 1e9 / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            callback(message)
+            count += 1
+        return count
@@ -0,0 +1,139 @@
+import logging
+import os
+import socket
+
+try:
+    import fcntl
+except ImportError:  # not on Windows, each process then spools under its pid
+    fcntl = None
+
+SEGMENT_SUFFIX = ".ilp"
+LOCK_NAME = ".lock"
+DEFAULT_SPOOL_DIR = os.getenv("WORKBENCH_QUEST_SPOOL", os.path.join(os.path.expanduser("~"), ".workbench", "quest_spool"))
+
+
+class IlpSpool:
+    """
+    Write-ahead spool of InfluxDB line protocol batches that could not be sent, kept as numbered segment files.
+    Batches are appended in arrival order and replayed oldest segment first, so rows of each table reach QuestDB in
+    the order they were produced. When the spool grows past max_bytes the oldest segments are discarded.
+    Several processes can spool under the same directory: each one claims the first numbered slot subdirectory no
+    live process holds a lock on, and replays the segments a previous owner of that slot left behind.
+    A segment is deleted once it was written to the socket. There is no acknowledgement in ILP over TCP, so a segment
+    sent on a connection that silently died is lost; one that failed while sending is sent again in full.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1024 ** 3, segment_bytes: int = 16 * 1024 ** 2):
+        """
+        :param directory: parent of the slot directories, shared by every writer to the same server.
+        """
+        self.logger = logging.getLogger("IlpSpool")
+        self._lock_file = None
+        self.directory = self._claim_slot(directory)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.dropped_rows = 0
+        self._segments = []  # segment paths, oldest first
+        self._sizes = {}  # path -> bytes
+        if os.path.isdir(self.directory):
+            for name in sorted(os.listdir(self.directory)):
+                if name.endswith(SEGMENT_SUFFIX):
+                    path = os.path.join(self.directory, name)
+                    self._segments.append(path)
+                    self._sizes[path] = os.path.getsize(path)
+        if self._segments:
+            self.logger.warning(f"Found {self.size} spooled bytes in {self.directory}, replaying on next connect")
+
+    def _claim_slot(self, parent: str) -> str:
+        if fcntl is None:
+            return os.path.join(parent, f"pid{os.getpid()}")
+        slot = 0
+        while True:
+            directory = os.path.join(parent, str(slot))
+            os.makedirs(directory, exist_ok=True)
+            lock_file = open(os.path.join(directory, LOCK_NAME), "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()  # held by another live writer
+                slot += 1
+                continue
+            self._lock_file = lock_file
+            return directory
+
+    def close(self):
+        """
+        Release the slot, segments still spooled stay for its next owner.
+        """
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    @property
+    def size(self) -> int:
+        return sum(self._sizes.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._segments)
+
+    def append(self, data: bytes):
+        """
+        Durably append one batch of ILP lines.
+        """
+        if not data:
+            return
+        path = self._segments[-1] if self._segments else None
+        if path is None or self._sizes[path] + len(data) > self.segment_bytes:
+            os.makedirs(self.directory, exist_ok=True)
+            seq = int(os.path.basename(path)[:-len(SEGMENT_SUFFIX)]) + 1 if path else 0
+            path = os.path.join(self.directory, f"{seq:012d}{SEGMENT_SUFFIX}")
+            self._segments.append(path)
+            self._sizes[path] = 0
+        with open(path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._sizes[path] += len(data)
+        self._enforce_cap()
+
+    def replay(self, send):
+        """
+        Send segments oldest first and delete each once sent.
+        :param send: callable(bytes), raising if the data could not be sent, which stops the replay.
+        :return: number of bytes replayed.
+        """
+        replayed = 0
+        while self._segments:
+            path = self._segments[0]
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                self.logger.warning(f"Spool segment {path} disappeared, skipping it")
+                self._segments.pop(0)
+                del self._sizes[path]
+                continue
+            send(data)
+            os.remove(path)
+            self._segments.pop(0)
+            del self._sizes[path]
+            replayed += len(data)
+        return replayed
+
+    def _enforce_cap(self):
+        while len(self._segments) > 1 and self.size > self.max_bytes:
+            path = self._segments.pop(0)
+            del self._sizes[path]
+            with open(path, "rb") as f:
+                rows = f.read().count(b"\n")
+            os.remove(path)
+            self.dropped_rows += rows
+            self.logger.error(f"Spool over {self.max_bytes} bytes, discarded {rows} rows from {path}")
+
+
+def send_ilp_tcp(host: str, port: int, data: bytes, timeout: float = 30.0):
+    """
+    Send raw ILP lines on a fresh TCP connection, closing it once everything was written.
+    """
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(data)
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import deque
+from queue import Empty
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+CONFLATE = "conflate"
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, CONFLATE)
+
+
+class IngestQueue:
+    """
+    Bounded FIFO between producers and a database writer thread, a drop-in for the `queue.Queue` calls the writers
+    use. When full, a put applies the policy:
+    - block: wait for room, up to block_timeout seconds if set, after which the row is dropped.
+    - drop_oldest: evict the oldest queued row.
+    - drop_newest: discard the row being put.
+    - conflate: overwrite the queued row with the same key(item) in place, e.g. the previous quote for a symbol,
+      and evict the oldest row if there is none.
+    dropped, blocked and conflated count the rows affected so memory stays bounded during database outages.
+    Items matching the pinned predicate, e.g. a batch of many rows, are never dropped or evicted under any policy: a
+    put of one waits for room, and eviction skips to the oldest unpinned item.
+    """
+
+    def __init__(self, maxsize: int = 100_000, policy: str = BLOCK, key=None, block_timeout: float = None,
+                 pinned=None):
+        if policy not in POLICIES:
+            raise ValueError("Unknown queue policy: {}".format(policy))
+        if policy == CONFLATE and key is None:
+            raise ValueError("conflate policy requires a key function")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.key = key
+        self.block_timeout = block_timeout
+        self.pinned = pinned
+        self.dropped = 0
+        self.blocked = 0
+        self.conflated = 0
+        self._items = deque()  # conflate stores [key, item] cells so a queued row can be overwritten in place
+        self._latest = {}  # key -> queued cell, conflate only
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def put(self, item):
+        with self._lock:
+            if len(self._items) >= self.maxsize and not self._make_room(item):
+                return
+            if self.policy == CONFLATE:
+                cell = [self.key(item), item]
+                self._latest[cell[0]] = cell
+                item = cell
+            self._items.append(item)
+            self._not_empty.notify()
+
+    put_nowait = put
+
+    def get(self, block: bool = True, timeout: float = None):
+        with self._lock:
+            if not self._items:
+                if not block:
+                    raise Empty
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while not self._items:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise Empty
+                    self._not_empty.wait(remaining)
+            item = self._items.popleft()
+            if self.policy == CONFLATE:
+                if self._latest.get(item[0]) is item:
+                    del self._latest[item[0]]
+                item = item[1]
+            self._not_full.notify()
+            return item
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    def _make_room(self, item) -> bool:
+        """
+        Called with the lock held on a full queue.
+        :return: True if item should still be appended.
+        """
+        pinned = self.pinned is not None and self.pinned(item)
+        if self.policy == BLOCK or pinned:
+            self.blocked += 1
+            timeout = None if pinned else self.block_timeout
+            if not self._wait_for_room(timeout):
+                self.dropped += 1
+                return False
+            return True
+        if self.policy == DROP_NEWEST:
+            self.dropped += 1
+            return False
+        if self.policy == CONFLATE:
+            cell = self._latest.get(self.key(item))
+            if cell is not None:
+                cell[1] = item
+                self.conflated += 1
+                return False
+        index = self._oldest_unpinned()
+        if index is None:
+            self.blocked += 1  # only pinned items queued, wait for the writer to take one
+            self._wait_for_room(None)
+            return True
+        evicted = self._items[index]
+        del self._items[index]
+        if self.policy == CONFLATE and self._latest.get(evicted[0]) is evicted:
+            del self._latest[evicted[0]]
+        self.dropped += 1
+        return True
+
+    def _oldest_unpinned(self):
+        if self.pinned is None:
+            return 0
+        for index, item in enumerate(self._items):
+            if not self.pinned(item[1] if self.policy == CONFLATE else item):
+                return index
+        return None
+
+    def _wait_for_room(self, timeout) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(self._items) >= self.maxsize:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._not_full.wait(remaining)
+        return True
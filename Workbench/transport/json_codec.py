@@ -0,0 +1,46 @@
+import json
+
+# Fastest JSON backend available, orjson > ujson > stdlib json. All three return the same Python types for
+# exchange payloads, dumps always returns str so the result can go straight into a text WebSocket frame.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj) -> str:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            # e.g. integers wider than 64 bits or custom objects, which stdlib json may still handle
+            return json.dumps(obj)
+
+elif ujson is not None:
+    BACKEND = "ujson"
+
+    def loads(data):
+        return ujson.loads(data)
+
+    def dumps(obj) -> str:
+        try:
+            return ujson.dumps(obj, ensure_ascii=False)
+        except (TypeError, OverflowError):
+            return json.dumps(obj)
+
+else:
+    BACKEND = "json"
+    loads = json.loads
+
+    def dumps(obj) -> str:
+        return json.dumps(obj)
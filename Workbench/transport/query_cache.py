@@ -0,0 +1,188 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.getenv("WORKBENCH_QUERY_CACHE", os.path.join(os.path.expanduser("~"), ".workbench", "query_cache"))
+DEFAULT_BUCKET = pd.Timedelta(days=1)
+DEFAULT_TTL = pd.Timedelta(hours=1)
+DEFAULT_SETTLE = pd.Timedelta(minutes=5)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Whitespace-insensitive form of a query, used as its cache key. String literals are left as they are.
+    """
+    return _WHITESPACE.sub(" ", sql).strip().rstrip(";").strip()
+
+
+def to_utc(ts) -> pd.Timestamp:
+    """
+    Timestamp in UTC, naive values are taken to be UTC already.
+    """
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def timestamp_literal(ts) -> str:
+    """
+    QuestDB SQL literal of a timestamp, see to_utc for naive values.
+    """
+    return "'" + to_utc(ts).strftime("%Y-%m-%dT%H:%M:%S.%fZ") + "'"
+
+
+class QueryCache:
+    """
+    Local Parquet cache in front of QuestDBClient.execute_query, keyed on normalized SQL.
+    execute_query caches a whole result until the end of the current ttl time bucket, e.g. `select distinct(symbol)
+    from funding_rate` is fetched at most once an hour.
+    query_range splits [start, end) on the timestamp column into buckets of `bucket`. A bucket that ended more than
+    `settle` ago is closed: fetched once and then always read from disk. The bucket still receiving rows is kept as
+    well and refreshed incrementally, only asking the database for rows from the newest cached timestamp on; the
+    cached rows at that timestamp are replaced by the refetched ones.
+    """
+
+    def __init__(self, client, cache_dir: str = DEFAULT_CACHE_DIR, bucket=DEFAULT_BUCKET, ttl=DEFAULT_TTL,
+                 settle=DEFAULT_SETTLE):
+        """
+        :param client: QuestDBClient used for cache misses.
+        """
+        self.logger = logging.getLogger("QueryCache")
+        self.client = client
+        self.cache_dir = cache_dir
+        self.bucket = pd.Timedelta(bucket)
+        self.ttl = pd.Timedelta(ttl)
+        self.settle = pd.Timedelta(settle)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def execute_query(self, query: str) -> pd.DataFrame:
+        """
+        Result of query, served from disk while the ttl bucket it was fetched in has not ended.
+        """
+        directory = self._directory(query)
+        bucket_id = int(time.time() // self.ttl.total_seconds())
+        path = os.path.join(directory, f"result_{bucket_id}.parquet")
+        with self._lock:
+            if os.path.exists(path):
+                self.hits += 1
+                return pd.read_parquet(path)
+            self.misses += 1
+            df = self.client.execute_query(query)
+            for name in os.listdir(directory):
+                if name.startswith("result_"):
+                    os.remove(os.path.join(directory, name))
+            self._save(df, path)
+            return df
+
+    def query_range(self, query: str, start, end=None, ts_col: str = "timestamp") -> pd.DataFrame:
+        """
+        Rows of query with ts_col in [start, end), end defaults to now.
+        The query is wrapped as a subquery and filtered on ts_col, so it must select that column.
+        """
+        start = to_utc(start)
+        now = pd.Timestamp.now(tz="UTC")
+        end = now if end is None else to_utc(end)
+        directory = self._directory(query)
+        first = start.floor(self.bucket)
+        buckets = list(pd.date_range(first, end, freq=self.bucket, inclusive="left")) or [first]
+        frames = []
+        missing = []  # runs of closed buckets to fetch in one query
+        with self._lock:
+            for bucket_start in buckets:
+                bucket_end = bucket_start + self.bucket
+                closed = bucket_end + self.settle <= now
+                path = os.path.join(directory, f"{bucket_start.value}{'' if closed else '.open'}.parquet")
+                if closed:
+                    if os.path.exists(path):
+                        self.hits += 1
+                        frames.append(pd.read_parquet(path))
+                        continue
+                    open_path = os.path.join(directory, f"{bucket_start.value}.open.parquet")
+                    if missing and missing[-1][-1] + self.bucket == bucket_start:
+                        missing[-1].append(bucket_start)
+                    else:
+                        missing.append([bucket_start])
+                    frames.append((bucket_start, open_path))
+                else:
+                    frames.append(self._refresh_open(query, ts_col, bucket_start, bucket_end, path))
+            fetched = {}
+            for run in missing:
+                self.misses += len(run)
+                df = self._fetch(query, ts_col, run[0], run[-1] + self.bucket)
+                times = self._times(df, ts_col)
+                for bucket_start in run:
+                    part = df[(times >= bucket_start) & (times < bucket_start + self.bucket)]
+                    self._save(part, os.path.join(directory, f"{bucket_start.value}.parquet"))
+                    fetched[bucket_start] = part
+            frames = [self._resolve(frame, fetched) for frame in frames]
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        times = self._times(df, ts_col)
+        return df[(times >= start) & (times < end)]
+
+    def invalidate(self, query: str = None):
+        if query is None and not os.path.isdir(self.cache_dir):
+            return
+        directories = [self._directory(query)] if query else [os.path.join(self.cache_dir, name)
+                                                             for name in os.listdir(self.cache_dir)]
+        for directory in directories:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+
+    def _resolve(self, frame, fetched: dict):
+        if not isinstance(frame, tuple):
+            return frame
+        bucket_start, open_path = frame
+        if os.path.exists(open_path):
+            os.remove(open_path)  # superseded by the closed bucket
+        return fetched[bucket_start]
+
+    def _refresh_open(self, query: str, ts_col: str, bucket_start, bucket_end, path: str) -> pd.DataFrame:
+        cached = pd.read_parquet(path) if os.path.exists(path) else None
+        if cached is not None and len(cached):
+            self.hits += 1
+            # refetch from the newest cached timestamp itself, rows may have landed on it after it was cached
+            times = self._times(cached, ts_col)
+            newest = times.max()
+            newer = self._fetch(query, ts_col, newest, bucket_end)
+            if not len(newer):
+                return cached
+            # saved even at an unchanged length, the rows at newest may have come back with corrected values
+            df = pd.concat([cached[times < newest], newer])
+        else:
+            self.misses += 1
+            df = self._fetch(query, ts_col, bucket_start, bucket_end)
+        self._save(df, path)
+        return df
+
+    def _fetch(self, query: str, ts_col: str, start, end) -> pd.DataFrame:
+        sql = (f"select * from ({normalize_sql(query)}) where {ts_col} >= {timestamp_literal(start)} "
+               f"and {ts_col} < {timestamp_literal(end)}")
+        return self.client.execute_query(sql)
+
+    @staticmethod
+    def _times(df: pd.DataFrame, ts_col: str):
+        times = df.index if df.index.name == ts_col else df[ts_col]
+        times = pd.DatetimeIndex(times)
+        return times.tz_localize("UTC") if times.tz is None else times.tz_convert("UTC")
+
+    def _directory(self, query: str) -> str:
+        key = hashlib.sha1(normalize_sql(query).encode()).hexdigest()
+        directory = os.path.join(self.cache_dir, key)
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def _save(self, df: pd.DataFrame, path: str):
+        tmp_path = path + ".tmp"
+        try:
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, path)  # readers never see a half written file
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not cache query result to {path}: {e}")
@@ -0,0 +1,75 @@
+import threading
+
+import pandas as pd
+
+from Workbench.transport.query_cache import timestamp_literal
+
+
+def _quote(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class TailQuery:
+    """
+    Incrementally refreshed time series per (table, symbol) on top of QuestDBClient.execute_query.
+    The first read fetches everything from start, later reads only ask for rows at or after the high-water
+    timestamp of what is already held, so refreshing a chart of months of funding is a delta query. Rows held at the
+    high-water timestamp are replaced by the refetched ones, which catches rows that landed on that same timestamp
+    after the previous read without duplicating the ones already held.
+    Results are indexed by timestamp, as returned by execute_query.
+    """
+
+    def __init__(self, client):
+        """
+        :param client: QuestDBClient (or QueryCache) with an execute_query(sql) method.
+        """
+        self.client = client
+        self._series = {}  # (table, symbol, columns, where) -> DataFrame
+        self._high_water = {}  # same key -> last timestamp held
+        self._lock = threading.Lock()
+
+    def get(self, table: str, symbol: str, start=None, columns: str = "*", where: str = None,
+            ts_col: str = "timestamp") -> pd.DataFrame:
+        """
+        Rows of table for symbol, refreshed with the rows newer than the last call.
+        :param start: earliest timestamp of the first fetch, everything when None. Ignored once the series is held.
+        :param where: extra SQL condition, e.g. "exchange = 'Hyperliquid'". Each distinct value is its own series.
+        """
+        key = (table, symbol, columns, where)
+        with self._lock:
+            high_water = self._high_water.get(key)
+            conditions = [f"symbol = {_quote(symbol)}"]
+            if where:
+                conditions.append(f"({where})")
+            if high_water is not None:
+                conditions.append(f"{ts_col} >= {timestamp_literal(high_water)}")
+            elif start is not None:
+                conditions.append(f"{ts_col} >= {timestamp_literal(start)}")
+            newer = self.client.execute_query(
+                f"select {columns} from {table} where {' and '.join(conditions)} order by {ts_col}")
+            held = self._series.get(key)
+            if held is None:
+                held = newer
+            elif len(newer):
+                held = pd.concat([held[self._times(held, ts_col) < high_water], newer])
+            if len(held):
+                self._high_water[key] = self._times(held, ts_col).max()
+            self._series[key] = held
+            return held
+
+    @staticmethod
+    def _times(df: pd.DataFrame, ts_col: str):
+        return df.index if df.index.name == ts_col else df[ts_col]
+
+    def high_water(self, table: str, symbol: str, columns: str = "*", where: str = None):
+        return self._high_water.get((table, symbol, columns, where))
+
+    def reset(self, table: str = None, symbol: str = None):
+        """
+        Drop held series so the next get fetches from start again, all of them by default.
+        """
+        with self._lock:
+            for key in list(self._series):
+                if (table is None or key[0] == table) and (symbol is None or key[1] == symbol):
+                    del self._series[key]
+                    self._high_water.pop(key, None)
@@ -0,0 +1,97 @@
+from Workbench.transport import json_codec
+
+
+class TopicRouter:
+    """
+    Routes raw WebSocket frames to per-topic handlers before they are decoded.
+    The topic is peeked from the raw str/bytes frame (exchanges send compact JSON such as `{"stream":"btcusdt@bookTicker",...`),
+    mapped to a route key once per distinct topic and cached, so frames for channels without a handler are dropped
+    without a JSON decode and only routed frames pay for the full parse.
+    """
+
+    def __init__(self, field: str, route_key=None, fallback=None):
+        """
+        :param field: top-level field holding the topic, e.g. "stream" (Binance), "topic" (Bybit), "ch" (HTX).
+        :param route_key: maps a topic to the key handlers are registered under, e.g.
+        "btcusdt@bookTicker" -> "bookTicker". Defaults to the topic itself.
+        :param fallback: called with the decoded message for frames without a topic (pings, pongs, acks),
+        such frames are dropped undecoded when no fallback is set.
+        """
+        self.field = field
+        self.route_key = route_key or (lambda topic: topic)
+        self.fallback = fallback
+        self.routes = {}  # route key -> handler
+        self.dropped = 0
+        self._table = {}  # topic -> handler or None, filled on first sight of each topic
+        self._marker = f'"{field}":"'
+        self._marker_bytes = self._marker.encode("utf-8")
+        self._field_token = f'"{field}"'
+        self._field_token_bytes = self._field_token.encode("utf-8")
+
+    def register(self, key: str, handler):
+        """
+        :param handler: called with the fully decoded message.
+        """
+        self.routes[key] = handler
+        self._table.clear()
+
+    def unregister(self, key: str):
+        self.routes.pop(key, None)
+        self._table.clear()
+
+    def _resolve(self, topic: str):
+        try:
+            handler = self.routes.get(self.route_key(topic))
+        except (IndexError, ValueError):
+            handler = None
+        self._table[topic] = handler
+        return handler
+
+    def peek_topic(self, raw):
+        """
+        Topic of a raw frame without decoding it, or None if the frame has no compact `"field":"..."` entry.
+        """
+        if isinstance(raw, str):
+            start = raw.find(self._marker)
+            if start < 0:
+                return None
+            start += len(self._marker)
+            return raw[start:raw.find('"', start)]
+        start = raw.find(self._marker_bytes)
+        if start < 0:
+            return None
+        start += len(self._marker_bytes)
+        return bytes(raw[start:raw.find(b'"', start)]).decode("utf-8")
+
+    def dispatch(self, raw):
+        topic = self.peek_topic(raw)
+        if topic is None:
+            self._dispatch_slow(raw)
+            return
+        handler = self._table.get(topic, False)
+        if handler is False:
+            handler = self._resolve(topic)
+        if handler is None:
+            self.dropped += 1
+            return
+        handler(json_codec.loads(raw))
+
+    def _dispatch_slow(self, raw):
+        # no compact topic entry: a control frame, or JSON with unusual spacing that still needs routing
+        field_present = (self._field_token in raw) if isinstance(raw, str) else (self._field_token_bytes in raw)
+        if self.fallback is None and not field_present:
+            self.dropped += 1
+            return
+        msg = json_codec.loads(raw)
+        topic = msg.get(self.field) if isinstance(msg, dict) else None
+        if topic is None:
+            if self.fallback is not None:
+                self.fallback(msg)
+            return
+        handler = self._table.get(topic, False)
+        if handler is False:
+            handler = self._resolve(topic)
+        if handler is not None:
+            handler(msg)
+        else:
+            self.dropped += 1
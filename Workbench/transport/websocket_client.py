@@ -1,10 +1,10 @@
 import logging
 import threading
-import json
+from Workbench.transport import json_codec
 import os
 import sys
 import ssl
-from queue import Queue as queue
+from queue import Queue as queue, Empty
 import websocket as ws
 import schedule
 
@@ -20,9 +20,13 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 
+# Sentinel that wakes the sender thread on stop()
+_STOP = object()
+
+
 class WebsocketClient(threading.Thread):
 
-    def __init__(self, url, callback=None, header=None):
+    def __init__(self, url, callback=None, header=None, max_coalesce: int = 10):
         logger.info("Initializing WebSocket client...URL: {}".format(url))
         self.is_running = True
         super(WebsocketClient, self).__init__()
@@ -35,24 +39,46 @@ class WebsocketClient(threading.Thread):
         self.webSocket = None
         self.is_start = False
         self.main_thread = None
+        self.recorder = None  # optional FrameRecorder capturing every raw frame
+        self.max_coalesce = max_coalesce  # max list entries merged into one coalesced frame
+        self.last_send_latency_us = 0.0  # send() call to socket write of the last frame
+        self._held = None
 
     def on_message(self, ws, message):
+        if self.recorder is not None:
+            self.recorder.write(message)
         try:
             self._callback(message)
         except:
             pass
 
-    def send(self, msg):
+    def send(self, msg, coalesce: str = None):
         """
-        Send a message to the WebSocket server.
+        Send a message to the WebSocket server. The payload is serialized on the calling thread and the
+        sender thread is woken immediately, messages sent before the socket opens are queued.
         :param msg: The message to send.
+        :param coalesce: name of a list field (e.g. "params" for Binance, "args" for Bybit) whose entries may be
+        merged with other queued messages that are identical apart from that field, so a burst of subscriptions
+        goes out as one frame.
         """
 
-        if self.is_running:
-
-            self.outgoing_queue.put(msg)
+        if not self.is_running:
+            logger.error("WebSocket client is not running.")
+            return
+        if coalesce is not None:
+            self.outgoing_queue.put((None, coalesce, msg, time.perf_counter_ns()))
         else:
+            payload = msg if msg == "ping" else self.messsagePraser(msg)
+            self.outgoing_queue.put((payload, None, None, time.perf_counter_ns()))
+
+    def send_raw(self, payload):
+        """
+        Send an already serialized str/bytes payload as is.
+        """
+        if not self.is_running:
             logger.error("WebSocket client is not running.")
+            return
+        self.outgoing_queue.put((payload, None, None, time.perf_counter_ns()))
 
     def on_error(self, ws, message):
         logger.error(message)
@@ -66,39 +92,62 @@ class WebsocketClient(threading.Thread):
         self._callback = callback
 
     def on_open(self, ws):
-        def run(*args):
-            while self.is_running:
-                try:
-                    while not self.outgoing_queue.empty():
-                        if not self.is_start:
-                            time.sleep(0.5)
-                            self.is_start = True
-                        else:
-                            time.sleep(0.00001)
-                        msg = self.outgoing_queue.get(block=True)
-                        if msg == "ping":
-                            ws.send("ping")
-                            continue
-                        ws.send(self.messsagePraser(msg))
-                        self.outgoing_queue.task_done()
-                    time.sleep(0.0001)
-                except Exception as e:
-                    logger.error(e)
-                    logger.error(self.wsUrl)
-                    self.is_running = False
-
-        self.main_thread = thread.start_new_thread(run, ())
+        self.is_start = True
+        self.main_thread = thread.start_new_thread(self._send_loop, (ws,))
+
+    def _send_loop(self, ws):
+        while self.is_running:
+            if self._held is not None:
+                item, self._held = self._held, None
+            else:
+                item = self.outgoing_queue.get()
+            if item is _STOP:
+                return
+            payload, field, msg, queued_ns = item
+            try:
+                if field is not None:
+                    payload = self.messsagePraser(self._coalesce(field, msg))
+                ws.send(payload)
+                self.last_send_latency_us = (time.perf_counter_ns() - queued_ns) / 1e3
+            except Exception as e:
+                logger.error(e)
+                logger.error(self.wsUrl)
+                self.is_running = False
+
+    def _coalesce(self, field: str, msg: dict) -> dict:
+        """
+        Merge queued messages that differ from msg only in `field` into one message.
+        """
+        merged = dict(msg)
+        merged[field] = list(msg[field])
+        while len(merged[field]) < self.max_coalesce:
+            try:
+                item = self.outgoing_queue.get_nowait()
+            except Empty:
+                break
+            if item is _STOP or item[1] != field or not self._same_except(item[2], msg, field) \
+                    or len(merged[field]) + len(item[2][field]) > self.max_coalesce:
+                self._held = item
+                break
+            merged[field].extend(item[2][field])
+        return merged
+
+    @staticmethod
+    def _same_except(a: dict, b: dict, field: str) -> bool:
+        return a.keys() == b.keys() and all(a[k] == b[k] for k in a if k != field)
 
     def on_close(self, ws, close_status_code, close_msg):
         logger.error(close_msg)
         logger.error("websocket is closed.")
         self.is_running = False
+        self.outgoing_queue.put(_STOP)
 
     def stop(self):
         logger.info("Stopping Websocket Client...")
         self.is_running = False
+        self.outgoing_queue.put(_STOP)
         self.webChannel.keep_running = False
-        self.stop()
+        self.webChannel.close()
 
     def run(self):
         self.webChannel = ws.WebSocketApp(self.wsUrl,
@@ -107,11 +156,10 @@ class WebsocketClient(threading.Thread):
                                           on_close=self.on_close,
                                           on_open=self.on_open,
                                           header=self.header if self.header is not None else None)
-        self.webChannel.on_open = self.on_open(self.webChannel)
         self.webChannel.run_forever(sslopt={"cert_reqs": 0}) #disable SSL certificate verification
 
     def messsagePraser(self, msg):
-        return json.dumps(msg)
+        return json_codec.dumps(msg)
 
     def messageLoader(self, msg):
-        return json.loads(msg)
+        return json_codec.loads(msg)
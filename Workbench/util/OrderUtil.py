@@ -1,13 +1,12 @@
 #write function to craete uuid
-import gzip
-import json
+import zlib
+from Workbench.transport import json_codec
 import uuid
 import hashlib
 import hmac
 import base64
 import urllib.parse
 import time
-from io import BytesIO
 
 
 def get_uuid(length:int=16) -> str:
@@ -44,11 +43,18 @@ def get_htx_signature(api_key, api_secret, method, base_url, request_path, param
         params['type'] = 'api'
     return params
 
+GZIP_WBITS = 16 + zlib.MAX_WBITS  # tells zlib to expect a gzip header and trailer
+
+
+def gunzip(message: bytes) -> bytes:
+    """
+    Decompress a single gzip frame (HTX sends one per WebSocket message) in one zlib call, without
+    the BytesIO/GzipFile wrappers.
+    """
+    return zlib.decompress(message, GZIP_WBITS)
+
 def decode_gzip_message(message: bytes) -> dict:
-    buf = BytesIO(message)
-    with gzip.GzipFile(fileobj=buf) as f:
-        decoded_bytes = f.read()
-    return json.loads(decoded_bytes.decode('utf-8'))
+    return json_codec.loads(zlib.decompress(message, GZIP_WBITS))
 
 def get_spread_bp(bp: float, sp: float) -> float:
     """
@@ -0,0 +1,181 @@
+"""
+Market-data hot path benchmark: JSON (or gzip) decode + collector handler + orderbook update per frame.
+
+    python -m benchmarks.bench_market_data                      # run and compare against benchmarks/baseline.json
+    python -m benchmarks.bench_market_data --save-baseline      # store this run as the new baseline
+    python -m benchmarks.bench_market_data --capture bybit_orderbook=/data/bybit.frames
+
+Exits with status 1 if any case is slower than the baseline by more than --tolerance.
+Baselines are machine specific, re-save them when moving to a different host. Re-save them as well in any change
+that makes the hot path faster: against a stale, slower baseline the tolerance absorbs real regressions.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from Workbench.CryptoDataConnector.InstrumentCache import InstrumentCache
+from Workbench.CryptoWebsocketDataCollector.BinanceWSCollector import BinanceWSCollector
+from Workbench.CryptoWebsocketDataCollector.BybitWSCollector import BybitWSCollector
+from Workbench.CryptoWebsocketDataCollector.HTXWSCollector import HtxWSCollector
+from Workbench.CryptoWebsocketDataCollector.HyperliquidWSCollector import HyperliquidWSCollector
+from Workbench.config.ConnectionConstant import QUEST_HOST, QUEST_PORT
+from Workbench.transport.QuestClient import QuestDBClient
+from Workbench.transport.frame_recorder import FrameReplayer
+from benchmarks import frames
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+# Contract details served by the offline InstrumentCache, so collectors build without network access
+INSTRUMENTS = {
+    "Binance": pd.DataFrame({"symbol": ["BTCUSDT"], "contractSize": [1.0],
+                             "contractType": ["PERPETUAL"], "quoteAsset": ["USDT"]}),
+    "Bybit": pd.DataFrame({"symbol": ["BTCUSDT"]}),
+    "HTX": pd.DataFrame({"contract_code": ["BTC-USDT"], "contract_size": [0.001], "price_tick": [0.1]}),
+    "Hyperliquid": None,
+}
+
+
+def _install_offline_instruments():
+    fetchers = {exchange: (lambda info=info: info) for exchange, info in INSTRUMENTS.items()}
+    InstrumentCache._instance = InstrumentCache(cache_dir=tempfile.mkdtemp(prefix="bench-instruments-"),
+                                                fetchers=fetchers)
+
+
+def _db_client():
+    # read-only mode skips the writer thread, batch_write still pays the real enqueue cost
+    return QuestDBClient(host=QUEST_HOST, port=QUEST_PORT, read_only=True)
+
+
+def binance_collector():
+    collector = BinanceWSCollector(start_quest=False)
+    collector.db_client = _db_client()
+    return collector
+
+
+def bybit_collector():
+    collector = BybitWSCollector(start_quest=False)
+    collector.db_client = _db_client()
+    collector.orderbook.add_orderbook("BTCUSDT")
+    return collector
+
+
+def htx_collector():
+    collector = HtxWSCollector(start_quest=False)
+    collector.orderbook.add_orderbook("BTC-USDT")
+    return collector
+
+
+def hyperliquid_collector():
+    collector = HyperliquidWSCollector(start_quest=False)
+    collector.db_client = _db_client()
+    collector.orderbook.add_orderbook("BTC", True)
+    return collector
+
+
+CASES = {
+    "binance_book_ticker": (binance_collector, frames.binance_book_ticker),
+    "bybit_orderbook": (bybit_collector, frames.bybit_orderbook),
+    "htx_depth_gzip": (htx_collector, frames.htx_depth),
+    "hyperliquid_l2book": (hyperliquid_collector, frames.hyperliquid_l2book),
+}
+
+
+def measure(handler, messages: list, warmup: int) -> dict:
+    for message in messages[:warmup]:
+        handler(message)
+    perf_ns = time.perf_counter_ns
+    latencies = []
+    start = perf_ns()
+    for message in messages[warmup:]:
+        t0 = perf_ns()
+        handler(message)
+        latencies.append(perf_ns() - t0)
+    elapsed = perf_ns() - start
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "messages": count,
+        "msgs_per_sec": count / (elapsed / 1e9),
+        "p50_us": latencies[count // 2] / 1e3,
+        "p99_us": latencies[min(count - 1, int(count * 0.99))] / 1e3,
+    }
+
+
+def run(count: int, warmup: int, captures: dict, cases: list) -> dict:
+    _install_offline_instruments()
+    results = {}
+    for name in cases:
+        build, generate = CASES[name]
+        collector = build()
+        if name in captures:
+            messages = [message for _, message in FrameReplayer(captures[name]).load()]
+        else:
+            messages = generate(count + warmup)
+        results[name] = measure(collector._message_handler, messages, min(warmup, len(messages) // 10))
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["msgs_per_sec"] < base["msgs_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['msgs_per_sec']:.0f} msg/s vs baseline {base['msgs_per_sec']:.0f}")
+        if result["p50_us"] > base["p50_us"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {result['p50_us']:.2f}us vs baseline {base['p50_us']:.2f}us")
+    return regressions
+
+
+def report(results: dict, baseline: dict):
+    print(f"{'case':<22}{'msgs':>9}{'msg/s':>12}{'p50 us':>10}{'p99 us':>10}{'vs base':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = f"{result['msgs_per_sec'] / base['msgs_per_sec'] - 1:+.1%}" if base else "n/a"
+        print(f"{name:<22}{result['messages']:>9}{result['msgs_per_sec']:>12.0f}"
+              f"{result['p50_us']:>10.2f}{result['p99_us']:>10.2f}{change:>10}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000, help="synthetic frames per case")
+    parser.add_argument("--warmup", type=int, default=1000)
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="run only these cases")
+    parser.add_argument("--capture", action="append", default=[], metavar="CASE=PATH",
+                        help="replay a FrameRecorder capture instead of synthetic frames")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed fractional slowdown")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    captures = dict(item.split("=", 1) for item in args.capture)
+    results = run(args.count, args.warmup, captures, args.case or list(CASES))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=4)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import gzip
+import json
+import random
+
+# Synthetic frames shaped like each venue's production messages, generated from a fixed seed so runs are comparable.
+
+BASE_PRICE = 65000.0
+TICK = 0.1
+
+
+def _levels(rng, best, sign, count, as_str=True):
+    levels = []
+    for i in range(count):
+        price = round(best + sign * i * TICK, 1)
+        qty = round(rng.uniform(0.001, 5.0), 3)
+        levels.append([str(price), str(qty)] if as_str else [price, qty])
+    return levels
+
+
+def _delta_levels(rng, best, sign, depth, count):
+    levels = []
+    for _ in range(count):
+        price = round(best + sign * rng.randrange(depth) * TICK, 1)
+        qty = 0.0 if rng.random() < 0.2 else round(rng.uniform(0.001, 5.0), 3)
+        levels.append([str(price), str(qty)])
+    return levels
+
+
+def binance_book_ticker(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    frames = []
+    ts = 1_750_000_000_000
+    for i in range(count):
+        bid = round(BASE_PRICE + rng.randrange(-50, 50) * TICK, 1)
+        frames.append(json.dumps({
+            "stream": "btcusdt@bookTicker",
+            "data": {"e": "bookTicker", "u": i, "s": "BTCUSDT",
+                     "b": str(bid), "B": str(round(rng.uniform(0.001, 5.0), 3)),
+                     "a": str(round(bid + TICK, 1)), "A": str(round(rng.uniform(0.001, 5.0), 3)),
+                     "T": ts + i, "E": ts + i}
+        }))
+    return frames
+
+
+def bybit_orderbook(count: int, depth: int = 50, seed: int = 2) -> list:
+    rng = random.Random(seed)
+    ts = 1_750_000_000_000
+    frames = [json.dumps({
+        "topic": f"orderbook.{depth}.BTCUSDT", "type": "snapshot", "ts": ts,
+        "data": {"s": "BTCUSDT", "b": _levels(rng, BASE_PRICE, -1, depth), "a": _levels(rng, BASE_PRICE + TICK, 1, depth),
+                 "u": 100, "seq": 1000},
+        "cts": ts})]
+    for i in range(1, count):
+        frames.append(json.dumps({
+            "topic": f"orderbook.{depth}.BTCUSDT", "type": "delta", "ts": ts + i,
+            "data": {"s": "BTCUSDT",
+                     "b": _delta_levels(rng, BASE_PRICE, -1, depth, rng.randint(1, 8)),
+                     "a": _delta_levels(rng, BASE_PRICE + TICK, 1, depth, rng.randint(1, 8)),
+                     "u": 100 + i, "seq": 1000 + i},
+            "cts": ts + i}))
+    return frames
+
+
+def htx_depth(count: int, depth: int = 20, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    ts = 1_750_000_000_000
+    frames = []
+    for i in range(count):
+        best = round(BASE_PRICE + rng.randrange(-50, 50) * TICK, 1)
+        msg = {"ch": "market.BTC-USDT.depth.step0", "ts": ts + i,
+               "tick": {"bids": _levels(rng, best, -1, depth, as_str=False),
+                        "asks": _levels(rng, best + TICK, 1, depth, as_str=False),
+                        "ts": ts + i, "version": i}}
+        frames.append(gzip.compress(json.dumps(msg).encode("utf-8")))
+    return frames
+
+
+def hyperliquid_l2book(count: int, depth: int = 20, seed: int = 4) -> list:
+    rng = random.Random(seed)
+    ts = 1_750_000_000_000
+    frames = []
+    for i in range(count):
+        best = round(BASE_PRICE + rng.randrange(-50, 50), 0)
+        bids = [{"px": price, "sz": qty, "n": rng.randint(1, 9)} for price, qty in _levels(rng, best, -1, depth)]
+        asks = [{"px": price, "sz": qty, "n": rng.randint(1, 9)} for price, qty in _levels(rng, best + 1, 1, depth)]
+        frames.append(json.dumps({"channel": "l2Book",
+                                  "data": {"coin": "BTC", "time": ts + i, "levels": [bids, asks]}}))
+    return frames